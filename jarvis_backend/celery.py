@@ -1,6 +1,7 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from django.conf import settings
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jarvis_backend.settings')
@@ -22,10 +23,10 @@ app.conf.beat_schedule = {
         'schedule': crontab(minute='*/5'),  # Every 5 minutes
         'options': {'queue': 'default'}
     },
-    # Full categorization of all tasks every 10 minutes (broader check)
+    # Full categorization for the daily date rollover; edits are handled by post_save signals
     'categorize-tasks-by-due-date': {
         'task': 'tasks_api.tasks.categorize_tasks_by_due_date',
-        'schedule': crontab(minute='*/10'),  # Every 10 minutes
+        'schedule': crontab(hour=0, minute=5),  # Daily just after midnight
         'options': {'queue': 'default'}
     },
     # Daily section maintenance at midnight
@@ -36,6 +37,14 @@ app.conf.beat_schedule = {
     },
 }
 
+# Refresh the materialized current_view column after the date rollover, when enabled
+if getattr(settings, 'USE_CURRENT_VIEW_FIELD', False):
+    app.conf.beat_schedule['update-task-current-view'] = {
+        'task': 'tasks_api.tasks.update_task_current_view',
+        'schedule': crontab(hour=0, minute=1),  # Daily just after midnight
+        'options': {'queue': 'default'}
+    }
+
 # Set the timezone for Celery Beat
 app.conf.timezone = 'UTC'
 
@@ -11,12 +11,28 @@ Generates optimized schedules from unsorted tasks based on:
 - Recurring patterns
 """
 
+from collections import deque
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Optional, Any
+from functools import lru_cache
+from typing import List, Dict, Optional, Any, Tuple, Deque
 from enum import Enum
 import logging
 
+import numpy as np
+
+from .scheduler_kernels import (
+    ENERGY_CODES,
+    UNKNOWN_ENERGY,
+    PREF_ANYTIME,
+    PREF_MATCH,
+    PREF_MISMATCH,
+    best_fit_placement,
+    push_overflow_forward,
+    urgency_scores,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,10 +55,12 @@ class Priority(Enum):
     @classmethod
     def from_string(cls, value: str) -> 'Priority':
         """Convert string to Priority enum"""
-        for p in cls:
-            if p.label == value.lower():
-                return p
-        return cls.MEDIUM  # Default
+        return _PRIORITY_BY_LABEL.get(value.lower(), cls.MEDIUM) if value else cls.MEDIUM
+
+
+# Label -> member lookup so parsing a priority is one hash probe
+_PRIORITY_BY_LABEL = {p.label: p for p in Priority}
+_PRIORITY_SCORES = {p.label: p.score for p in Priority}
 
 
 class TimeSlot(Enum):
@@ -59,6 +77,13 @@ class TimeSlot(Enum):
         self.energy_profile = energy
 
 
+# Slot label -> int code; codes index DaySchedule.slots
+_SLOT_CODES = {slot.label: code for code, slot in enumerate(TimeSlot)}
+
+# Per-slot capacities in slot code order when no custom capacities are given
+_DEFAULT_SLOT_CAPACITIES = tuple(slot.default_capacity for slot in TimeSlot)
+
+
 # Scoring weights
 WEIGHTS = {
     'deadline': 0.40,
@@ -74,15 +99,34 @@ ENERGY_MATCH_SCORES = {
     'low': {'high': 40, 'medium': 70, 'low': 100}
 }
 
+
+def _build_energy_matrix() -> np.ndarray:
+    """ENERGY_MATCH_SCORES as an int8 matrix indexed [slot code, task code]"""
+    # Row/column UNKNOWN_ENERGY holds the 50-point score for unrecognized labels
+    matrix = np.full((UNKNOWN_ENERGY + 1, UNKNOWN_ENERGY + 1), 50, dtype=np.int8)
+    for slot_energy, row in ENERGY_MATCH_SCORES.items():
+        for task_energy, score in row.items():
+            matrix[ENERGY_CODES[slot_energy], ENERGY_CODES[task_energy]] = score
+    return matrix
+
+
+_ENERGY_MATRIX = _build_energy_matrix()
+
 # Default daily capacity in minutes
 DEFAULT_DAILY_CAPACITY = 450  # 7.5 hours
 
+# Task columns the scheduler reads; querysets are fetched as .values() rows
+SCHEDULER_TASK_FIELDS = (
+    'id', 'name', 'duration_in_minutes', 'priority', 'due_date',
+    'repeat', 'completed', 'totally_completed',
+)
+
 
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ScheduledTask:
     """A task instance scheduled to a specific slot"""
     task_id: str
@@ -114,32 +158,38 @@ class ScheduledTask:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DaySlot:
     """Represents a time slot within a day"""
     slot: TimeSlot
     tasks: List[ScheduledTask] = field(default_factory=list)
     capacity: int = 0  # Set in __post_init__
+    # Running total of scheduled minutes, kept in step by add_task so
+    # capacity checks don't re-sum every task already in the slot
+    used_minutes: int = field(default=0, init=False, repr=False)
 
     def __post_init__(self):
         if self.capacity == 0:
             self.capacity = self.slot.default_capacity
+        self.used_minutes = sum(t.duration for t in self.tasks)
 
     @property
     def remaining_capacity(self) -> int:
-        used = sum(t.duration for t in self.tasks)
-        return max(0, self.capacity - used)
+        return max(0, self.capacity - self.used_minutes)
 
     @property
     def total_minutes(self) -> int:
-        return sum(t.duration for t in self.tasks)
+        return self.used_minutes
 
     def can_fit(self, duration: int) -> bool:
-        return self.remaining_capacity >= duration
+        return max(0, self.capacity - self.used_minutes) >= duration
 
     def add_task(self, task: ScheduledTask) -> bool:
-        if self.can_fit(task.duration):
+        # Capacity check inlined: this runs for every slot tried per task
+        duration = task.duration
+        if max(0, self.capacity - self.used_minutes) >= duration:
             self.tasks.append(task)
+            self.used_minutes += duration
             return True
         return False
 
@@ -155,21 +205,23 @@ class DaySlot:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DaySchedule:
     """Represents a full day's schedule"""
     date: date
     morning: DaySlot = field(default_factory=lambda: DaySlot(TimeSlot.MORNING))
     afternoon: DaySlot = field(default_factory=lambda: DaySlot(TimeSlot.AFTERNOON))
     evening: DaySlot = field(default_factory=lambda: DaySlot(TimeSlot.EVENING))
-    overflow: List[ScheduledTask] = field(default_factory=list)
+    overflow: Deque[ScheduledTask] = field(default_factory=deque)
+
+    @property
+    def slots(self) -> Tuple[DaySlot, DaySlot, DaySlot]:
+        """Slots in _SLOT_CODES order: morning, afternoon, evening"""
+        return (self.morning, self.afternoon, self.evening)
 
     def get_slot(self, slot_name: str) -> Optional[DaySlot]:
-        return {
-            'morning': self.morning,
-            'afternoon': self.afternoon,
-            'evening': self.evening
-        }.get(slot_name)
+        code = _SLOT_CODES.get(slot_name)
+        return None if code is None else self.slots[code]
 
     @property
     def total_scheduled_minutes(self) -> int:
@@ -195,27 +247,41 @@ class DaySchedule:
                 self.afternoon.tasks +
                 self.evening.tasks)
 
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, date_key: Optional[str] = None) -> Dict[str, Any]:
+        """Serialize the day; date_key is the precomputed ISO date, if the caller has it"""
+        utilization = self.utilization
         warnings = []
         if self.overflow:
             warnings.append(f"{len(self.overflow)} task(s) could not be scheduled")
-        if self.utilization > 90:
+        if utilization > 90:
             warnings.append("Day is heavily loaded (>90% utilization)")
 
         return {
-            'date': self.date.isoformat(),
+            'date': date_key or self.date.isoformat(),
             'morning': self.morning.to_dict(),
             'afternoon': self.afternoon.to_dict(),
             'evening': self.evening.to_dict(),
             'overflow': [t.to_dict() for t in self.overflow],
             'total_scheduled_minutes': self.total_scheduled_minutes,
             'total_capacity': self.total_capacity,
-            'utilization': f"{self.utilization:.1f}%",
-            'task_count': len(self.all_tasks),
+            'utilization': f"{utilization:.1f}%",
+            'task_count': len(self.morning.tasks) + len(self.afternoon.tasks) + len(self.evening.tasks),
             'warnings': warnings
         }
 
 
+@dataclass(slots=True)
+class ScoredTask:
+    """A normalized task with its urgency score and int-coded placement inputs"""
+    task_data: Dict[str, Any]
+    target_date: date
+    preferred_slot: str
+    day_offset: int
+    slot_code: int  # _SLOT_CODES value of preferred_slot, -1 if unknown
+    urgent: bool
+    score: float = 0.0
+
+
 # =============================================================================
 # SCORING FUNCTIONS
 # =============================================================================
@@ -256,9 +322,48 @@ def calculate_deadline_factor(due_date: Optional[date], reference_date: date) ->
         return max(10.0, 30.0 - (days_until_due - 14) * 0.5)
 
 
+# Day-count bin edges for calculate_deadline_factors: <0 | 0 | 1 | 2-3 | 4-7 | 8-14 | 15+
+_DEADLINE_BIN_EDGES = np.array([0, 1, 2, 4, 8, 15])
+# Score per bin; NaN marks the overdue and far-future bins computed separately
+_DEADLINE_BIN_SCORES = np.array([np.nan, 95.0, 85.0, 70.0, 50.0, 30.0, np.nan])
+
+
+def calculate_deadline_factors(due_dates: List[Optional[date]], reference_date: date) -> np.ndarray:
+    """
+    Vectorized calculate_deadline_factor over many due dates at once.
+
+    Args:
+        due_dates: Due dates in task order; None means no deadline
+        reference_date: Date the scores are relative to
+
+    Returns:
+        float64 array of deadline factors, element-wise equal to
+        calculate_deadline_factor for each date
+    """
+    due = np.array(due_dates, dtype='datetime64[D]')
+    no_deadline = np.isnat(due)
+    days = (due - np.datetime64(reference_date, 'D')).astype(np.int64)
+    days[no_deadline] = 0
+
+    # One binary-search pass picks each bin; the fixed bins read their score
+    # from the table and only the two sloped bins need arithmetic
+    bins = np.digitize(days, _DEADLINE_BIN_EDGES)
+    factors = _DEADLINE_BIN_SCORES[bins]
+
+    overdue = bins == 0
+    factors[overdue] = np.minimum(150.0, 100.0 - days[overdue] * 5.0)
+    far_future = bins == len(_DEADLINE_BIN_EDGES)
+    factors[far_future] = np.maximum(10.0, 30.0 - (days[far_future] - 14) * 0.5)
+
+    factors[no_deadline] = 20.0
+    return factors
+
+
 def calculate_priority_factor(priority: str) -> float:
     """Convert priority string to numeric score (0-100)"""
-    return Priority.from_string(priority).score
+    if not priority:
+        return Priority.MEDIUM.score
+    return _PRIORITY_SCORES.get(priority.lower(), Priority.MEDIUM.score)
 
 
 def calculate_energy_match(task_energy: str, slot_energy: str) -> float:
@@ -273,7 +378,10 @@ def calculate_energy_match(task_energy: str, slot_energy: str) -> float:
     task_energy = task_energy.lower() if task_energy else 'medium'
     slot_energy = slot_energy.lower() if slot_energy else 'medium'
 
-    return ENERGY_MATCH_SCORES.get(slot_energy, {}).get(task_energy, 50.0)
+    return int(_ENERGY_MATRIX[
+        ENERGY_CODES.get(slot_energy, UNKNOWN_ENERGY),
+        ENERGY_CODES.get(task_energy, UNKNOWN_ENERGY)
+    ])
 
 
 def calculate_time_preference_match(task_preference: str, slot_name: str) -> float:
@@ -318,6 +426,73 @@ def calculate_urgency_score(
     return deadline_score + priority_score + energy_score + time_pref_score
 
 
+# Array forms of the scoring tables for the batch kernel in scheduler_kernels
+_WEIGHT_VECTOR = np.array([
+    WEIGHTS['deadline'], WEIGHTS['priority'], WEIGHTS['energy_match'], WEIGHTS['time_preference']
+])
+_WEIGHT_VECTOR.flags.writeable = False
+assert abs(_WEIGHT_VECTOR.sum() - 1.0) < 1e-5, "Scoring WEIGHTS must sum to 1.0"
+_SLOT_ENERGY_CODES = {slot.label: ENERGY_CODES[slot.energy_profile] for slot in TimeSlot}
+
+
+def _normalize_label(value: Optional[str], default: str) -> str:
+    """Lowercase a priority/energy/preference label, falling back to default"""
+    return value.lower() if value else default
+
+
+def _time_preference_code(task_preference: str, slot_name: str) -> int:
+    """
+    Encode calculate_time_preference_match's outcome as a PREF_* code.
+    Expects a preference already passed through _normalize_label.
+    """
+    if task_preference == 'anytime':
+        return PREF_ANYTIME
+    if task_preference == slot_name:
+        return PREF_MATCH
+    return PREF_MISMATCH
+
+
+@lru_cache(maxsize=1024)
+def _recurrence_occurrences(
+    repeat_pattern: str,
+    due_date: Optional[date],
+    start_date: date,
+    horizon: int
+) -> Tuple[Tuple[date, str], ...]:
+    """
+    Occurrence dates of a recurring task within the planning horizon.
+
+    Depends only on its arguments, so results are memoized across schedules.
+
+    Returns:
+        (scheduled_for, instance id suffix) pairs in calendar order
+    """
+    if repeat_pattern == 'every day':
+        return tuple(
+            (start_date + timedelta(days=day_offset), f"day_{day_offset}")
+            for day_offset in range(horizon)
+        )
+
+    if repeat_pattern == 'every week':
+        horizon_end = start_date + timedelta(days=horizon)
+        return tuple(
+            (start_date + timedelta(weeks=week), f"week_{week}")
+            for week in range((horizon // 7) + 1)
+            if start_date + timedelta(weeks=week) < horizon_end
+        )
+
+    if repeat_pattern == 'every month':
+        # Only one instance within typical 14-day horizon
+        return ((start_date, "month_0"),)
+
+    if repeat_pattern == 'every year':
+        # Only include if due date falls within horizon
+        if due_date and start_date <= due_date < start_date + timedelta(days=horizon):
+            return ((due_date, "year_0"),)
+
+    return ()
+
+
 # =============================================================================
 # MAIN SCHEDULER CLASS
 # =============================================================================
@@ -331,6 +506,21 @@ class TaskScheduler:
         schedule = scheduler.generate_schedule()
     """
 
+    # Fallbacks for keys a task mapping may leave out, merged in once by
+    # _normalize_task so every later lookup can index directly
+    _DEFAULTS = {
+        'id': '',
+        'name': 'Untitled Task',
+        'duration': 30,
+        'priority': 'medium',
+        'due_date': None,
+        'repeat': None,
+        'energy_level': 'medium',
+        'time_preference': 'anytime',
+        'completed': False,
+        'totally_completed': False,
+    }
+
     def __init__(
         self,
         tasks: List[Any],
@@ -350,8 +540,31 @@ class TaskScheduler:
         self.tasks = tasks
         self.start_date = start_date or date.today()
         self.horizon = planning_horizon_days
+        self.end_date = self.start_date + timedelta(days=self.horizon - 1)
         self.slot_capacities = slot_capacities or {}
+        # Capacity of each slot in slot code order, resolved once for every
+        # day; 0 falls back to the default as in DaySlot.__post_init__
+        self._slot_capacity = tuple(
+            self.slot_capacities.get(slot.label) or slot.default_capacity for slot in TimeSlot
+        ) if self.slot_capacities else _DEFAULT_SLOT_CAPACITIES
         self.schedule: Dict[date, DaySchedule] = {}
+        # task_id -> (date, slot, position), filled in once the schedule is final
+        self._position_index: Dict[str, Tuple[date, str, int]] = {}
+
+        # Placement state while tasks are being allocated: (day, slot) grids of
+        # scheduled and available minutes, and each ranked task's cell
+        # (slot -1 = overflow); written into self.schedule by _materialize_schedule
+        self._ranked: List[ScoredTask] = []
+        self._durations: Optional[np.ndarray] = None
+        self._used: Optional[np.ndarray] = None
+        self._capacity: Optional[np.ndarray] = None
+        self._day_idx: Optional[np.ndarray] = None
+        self._slot_idx: Optional[np.ndarray] = None
+        self._moved: Optional[np.ndarray] = None
+
+        # Horizon dates and their output keys, computed once per scheduler
+        self._days = [self.start_date + timedelta(days=offset) for offset in range(self.horizon)]
+        self._day_keys = [day.isoformat() for day in self._days]
 
     def generate_schedule(self) -> Dict[str, Any]:
         """
@@ -373,7 +586,7 @@ class TaskScheduler:
 
         # Step 3: Score and sort tasks
         scored_tasks = self._score_tasks(all_task_instances)
-        sorted_tasks = sorted(scored_tasks, key=lambda x: x['score'], reverse=True)
+        sorted_tasks = self._rank_tasks(scored_tasks)
 
         # Step 4: Allocate tasks to slots
         self._allocate_tasks(sorted_tasks)
@@ -381,44 +594,38 @@ class TaskScheduler:
         # Step 5: Resolve conflicts and overflow
         self._resolve_conflicts()
 
-        # Step 6: Generate output
+        # Step 6: Write placements into the day schedules
+        self._materialize_schedule()
+
+        # Step 7: Generate output
         return self._generate_output()
 
     def _initialize_schedule(self):
         """Create empty schedule structure for each day in the horizon"""
-        for day_offset in range(self.horizon):
-            day = self.start_date + timedelta(days=day_offset)
-
-            # Apply custom slot capacities if provided
-            morning = DaySlot(
-                TimeSlot.MORNING,
-                capacity=self.slot_capacities.get('morning', TimeSlot.MORNING.default_capacity)
-            )
-            afternoon = DaySlot(
-                TimeSlot.AFTERNOON,
-                capacity=self.slot_capacities.get('afternoon', TimeSlot.AFTERNOON.default_capacity)
-            )
-            evening = DaySlot(
-                TimeSlot.EVENING,
-                capacity=self.slot_capacities.get('evening', TimeSlot.EVENING.default_capacity)
-            )
-
+        morning_capacity, afternoon_capacity, evening_capacity = self._slot_capacity
+        for day in self._days:
             self.schedule[day] = DaySchedule(
                 date=day,
-                morning=morning,
-                afternoon=afternoon,
-                evening=evening
+                morning=DaySlot(TimeSlot.MORNING, capacity=morning_capacity),
+                afternoon=DaySlot(TimeSlot.AFTERNOON, capacity=afternoon_capacity),
+                evening=DaySlot(TimeSlot.EVENING, capacity=evening_capacity)
             )
 
     def _process_tasks(self) -> tuple:
-        """Separate one-time tasks and expand recurring tasks into instances"""
+        """
+        Separate one-time tasks and expand recurring tasks into instances.
+        Completed tasks are dropped here, before expansion, so no later step
+        sees them.
+        """
         one_time_tasks = []
         recurring_instances = []
 
         for task in self.tasks:
             task_data = self._normalize_task(task)
+            if task_data['completed'] or task_data['totally_completed']:
+                continue
 
-            if task_data.get('repeat'):
+            if task_data['repeat']:
                 instances = self._expand_recurring_task(task_data)
                 recurring_instances.extend(instances)
             else:
@@ -429,36 +636,45 @@ class TaskScheduler:
     def _normalize_task(self, task: Any) -> Dict[str, Any]:
         """
         Normalize task to dictionary format.
-        Handles both Django model instances and dictionaries.
+        Handles both Django model instances and mappings, and lowercases
+        priority, energy level and time preference once for the scoring path.
+        Every result carries the same keys, including the recurring-instance
+        ones, so downstream code indexes instead of calling .get().
         """
-        if isinstance(task, dict):
-            return {
-                'id': str(task.get('id', '')),
-                'name': task.get('name', 'Untitled Task'),
-                'duration': task.get('duration_in_minutes', task.get('duration', 30)),
-                'priority': task.get('priority', 'medium'),
-                'due_date': self._parse_date(task.get('due_date')),
-                'repeat': task.get('repeat'),
-                'energy_level': task.get('energy_level', 'medium'),
-                'time_preference': task.get('time_preference', 'anytime'),
-                'completed': task.get('completed', False),
-                'totally_completed': task.get('totally_completed', False)
+        if isinstance(task, Mapping):
+            task = {**self._DEFAULTS, **task}
+            task_data = {
+                'id': str(task['id']),
+                'name': task['name'],
+                'duration': task.get('duration_in_minutes', task['duration']),
+                'priority': _normalize_label(task['priority'], 'medium'),
+                'due_date': self._parse_date(task['due_date']),
+                'repeat': task['repeat'],
+                'energy_level': _normalize_label(task['energy_level'], 'medium'),
+                'time_preference': _normalize_label(task['time_preference'], 'anytime'),
+                'completed': task['completed'],
+                'totally_completed': task['totally_completed']
             }
         else:
             # Django model instance
-            return {
+            task_data = {
                 'id': str(task.id),
                 'name': task.name,
                 'duration': getattr(task, 'duration_in_minutes', 30),
-                'priority': task.priority,
+                'priority': _normalize_label(task.priority, 'medium'),
                 'due_date': task.due_date,
                 'repeat': task.repeat,
-                'energy_level': getattr(task, 'energy_level', 'medium'),
-                'time_preference': getattr(task, 'time_preference', 'anytime'),
+                'energy_level': _normalize_label(getattr(task, 'energy_level', None), 'medium'),
+                'time_preference': _normalize_label(getattr(task, 'time_preference', None), 'anytime'),
                 'completed': task.completed,
                 'totally_completed': task.totally_completed
             }
 
+        task_data['scheduled_for'] = None
+        task_data['is_recurring_instance'] = False
+        task_data['original_task_id'] = None
+        return task_data
+
     def _parse_date(self, date_value: Any) -> Optional[date]:
         """Parse date from various formats"""
         if date_value is None:
@@ -480,246 +696,247 @@ class TaskScheduler:
     def _expand_recurring_task(self, task_data: Dict) -> List[Dict]:
         """Generate instances for recurring tasks within the planning horizon"""
         instances = []
-        repeat_pattern = task_data.get('repeat', '')
-
-        if repeat_pattern == 'every day':
-            for day_offset in range(self.horizon):
-                instance = task_data.copy()
-                instance['scheduled_for'] = self.start_date + timedelta(days=day_offset)
-                instance['is_recurring_instance'] = True
-                instance['original_task_id'] = task_data['id']
-                instance['id'] = f"{task_data['id']}_day_{day_offset}"
-                instances.append(instance)
-
-        elif repeat_pattern == 'every week':
-            for week in range((self.horizon // 7) + 1):
-                target_date = self.start_date + timedelta(weeks=week)
-                if target_date < self.start_date + timedelta(days=self.horizon):
-                    instance = task_data.copy()
-                    instance['scheduled_for'] = target_date
-                    instance['is_recurring_instance'] = True
-                    instance['original_task_id'] = task_data['id']
-                    instance['id'] = f"{task_data['id']}_week_{week}"
-                    instances.append(instance)
-
-        elif repeat_pattern == 'every month':
-            # Only one instance within typical 14-day horizon
+        repeat_pattern = task_data['repeat']
+        if not isinstance(repeat_pattern, str):
+            return instances  # Unknown pattern shape; also keeps the cache key hashable
+
+        occurrences = _recurrence_occurrences(
+            repeat_pattern, task_data['due_date'], self.start_date, self.horizon
+        )
+
+        for scheduled_for, id_suffix in occurrences:
             instance = task_data.copy()
-            instance['scheduled_for'] = self.start_date
+            instance['scheduled_for'] = scheduled_for
             instance['is_recurring_instance'] = True
             instance['original_task_id'] = task_data['id']
-            instance['id'] = f"{task_data['id']}_month_0"
+            instance['id'] = f"{task_data['id']}_{id_suffix}"
             instances.append(instance)
 
-        elif repeat_pattern == 'every year':
-            # Only include if due date falls within horizon
-            if task_data.get('due_date'):
-                due = task_data['due_date']
-                if self.start_date <= due < self.start_date + timedelta(days=self.horizon):
-                    instance = task_data.copy()
-                    instance['scheduled_for'] = due
-                    instance['is_recurring_instance'] = True
-                    instance['original_task_id'] = task_data['id']
-                    instance['id'] = f"{task_data['id']}_year_0"
-                    instances.append(instance)
-
         return instances
 
-    def _score_tasks(self, tasks: List[Dict]) -> List[Dict]:
+    def _score_tasks(self, tasks: List[Dict]) -> List[ScoredTask]:
         """Calculate urgency scores for all tasks"""
         scored = []
 
-        for task_data in tasks:
-            # Skip completed tasks
-            if task_data.get('completed') or task_data.get('totally_completed'):
-                continue
+        # Completed tasks were dropped in _process_tasks; score every
+        # deadline in one vector pass
+        deadline_factors = calculate_deadline_factors(
+            [task_data['due_date'] for task_data in tasks], self.start_date
+        )
+
+        # Encode each task's attributes; the weighted sum runs in one kernel call
+        priorities = []
+        task_energies = []
+        slot_energies = []
+        pref_matches = []
 
+        for task_data in tasks:
             # Determine target date
-            target_date = task_data.get('scheduled_for') or task_data.get('due_date')
+            target_date = task_data['scheduled_for'] or task_data['due_date']
             if target_date is None:
                 target_date = self.start_date  # No date = schedule ASAP
 
             # Ensure target is within horizon
-            end_date = self.start_date + timedelta(days=self.horizon - 1)
-            if target_date > end_date:
-                target_date = end_date
+            if target_date > self.end_date:
+                target_date = self.end_date
             if target_date < self.start_date:
                 target_date = self.start_date  # Overdue = schedule ASAP
 
             # Get preferred slot
             preferred_slot = self._get_preferred_slot(task_data)
-            slot_energy = TimeSlot.MORNING.energy_profile
-            for slot in TimeSlot:
-                if slot.label == preferred_slot:
-                    slot_energy = slot.energy_profile
-                    break
-
-            # Calculate score
-            score = calculate_urgency_score(
-                due_date=task_data.get('due_date'),
-                priority=task_data.get('priority', 'medium'),
-                task_energy=task_data.get('energy_level', 'medium'),
-                task_time_preference=task_data.get('time_preference', 'anytime'),
-                slot_name=preferred_slot,
-                slot_energy=slot_energy,
-                reference_date=self.start_date
-            )
 
-            scored.append({
-                'task_data': task_data,
-                'score': score,
-                'target_date': target_date,
-                'preferred_slot': preferred_slot
-            })
+            # Labels were lowercased in _normalize_task, so these are plain lookups
+            priority_score = _PRIORITY_SCORES.get(task_data['priority'], Priority.MEDIUM.score)
+            priorities.append(priority_score)
+            task_energies.append(ENERGY_CODES.get(task_data['energy_level'], UNKNOWN_ENERGY))
+            slot_energies.append(_SLOT_ENERGY_CODES.get(preferred_slot, ENERGY_CODES['high']))
+            pref_matches.append(_time_preference_code(task_data['time_preference'], preferred_slot))
+
+            scored.append(ScoredTask(
+                task_data=task_data,
+                target_date=target_date,
+                preferred_slot=preferred_slot,
+                # Int-coded placement inputs, so allocation never compares labels
+                day_offset=(target_date - self.start_date).days,
+                slot_code=_SLOT_CODES.get(preferred_slot, -1),
+                urgent=priority_score >= Priority.URGENT.score
+            ))
+
+        scores = urgency_scores(
+            deadline_factors,
+            np.array(priorities, dtype=np.float64),
+            np.array(task_energies, dtype=np.int8),
+            np.array(slot_energies, dtype=np.int8),
+            np.array(pref_matches, dtype=np.int8),
+            _ENERGY_MATRIX,
+            _WEIGHT_VECTOR,
+        )
+        for item, score in zip(scored, scores.tolist()):
+            item.score = score
 
         return scored
 
+    def _rank_tasks(self, scored: List[ScoredTask]) -> List[ScoredTask]:
+        """
+        Order scored tasks by descending score, longer tasks first on equal
+        scores (the "decreasing" half of best-fit-decreasing), then input order
+        """
+        scores = np.fromiter((item.score for item in scored), dtype=np.float64, count=len(scored))
+        durations = np.array([item.task_data['duration'] for item in scored], dtype=np.float64)
+        # lexsort is stable and sorts by its last key first
+        order = np.lexsort((-durations, -scores))
+        return [scored[i] for i in order.tolist()]
+
     def _get_preferred_slot(self, task_data: Dict) -> str:
         """Determine best slot based on task attributes"""
 
         # Explicit time preference takes precedence
-        time_pref = task_data.get('time_preference', 'anytime')
+        time_pref = task_data['time_preference']
         if time_pref and time_pref != 'anytime':
             return time_pref
 
         # Infer from energy level
-        energy = task_data.get('energy_level', 'medium')
+        energy = task_data['energy_level']
         if energy == 'high':
             return 'morning'
         elif energy == 'low':
             return 'evening'
 
         # Infer from priority (high priority = morning for focus)
-        priority = task_data.get('priority', 'medium')
+        priority = task_data['priority']
         if priority in ['emergency', 'urgent']:
             return 'morning'
 
         return 'afternoon'  # Default
 
-    def _allocate_tasks(self, sorted_tasks: List[Dict]):
+    def _allocate_tasks(self, sorted_tasks: List[ScoredTask]):
         """Allocate tasks to time slots using greedy algorithm"""
+        self._ranked = sorted_tasks
+        self._durations = np.array(
+            [item.task_data['duration'] for item in sorted_tasks], dtype=np.float64
+        )
+        # Nothing is placed yet, and every day has the same slot capacities
+        days = len(self._days)
+        self._used = np.zeros((days, len(self._slot_capacity)))
+        self._capacity = np.tile(np.array(self._slot_capacity, dtype=np.float64), (days, 1))
+
+        target_days = np.array([item.day_offset for item in sorted_tasks], dtype=np.int64)
+        slot_codes = np.array([item.slot_code for item in sorted_tasks], dtype=np.int64)
+        urgent = np.array([item.urgent for item in sorted_tasks], dtype=np.bool_)
+
+        # Zero-minute tasks always fit their preferred slot and use no
+        # capacity, so they are assigned directly; only the rest are packed
+        instant = (self._durations == 0) & (slot_codes >= 0)
+        packed = np.nonzero(~instant)[0]
+        self._day_idx = target_days.copy()
+        self._slot_idx = slot_codes.copy()
+
+        # Placement runs as one best-fit kernel pass over the encoded tasks
+        self._day_idx[packed], self._slot_idx[packed] = best_fit_placement(
+            self._durations[packed],
+            target_days[packed],
+            slot_codes[packed],
+            urgent[packed],
+            self._used,
+            self._capacity,
+        )
 
-        for item in sorted_tasks:
-            task_data = item['task_data']
-            target_date = item['target_date']
-            preferred_slot = item['preferred_slot']
-            score = item['score']
-
-            # Create ScheduledTask object
+    def _resolve_conflicts(self):
+        """Handle overflowed tasks by trying to reschedule to future days"""
+        # Overflow may move up to 7 days ahead
+        self._moved = push_overflow_forward(
+            self._durations, self._day_idx, self._slot_idx,
+            self._used, self._capacity, min(8, self.horizon)
+        )
+
+    def _materialize_schedule(self):
+        """Build ScheduledTask objects and place them in self.schedule"""
+        scheduled_tasks = []
+        moved = set(self._moved.tolist())
+        # Plain lists and a day-indexed view of self.schedule, so the loop does
+        # no NumPy scalar indexing or date hashing per task
+        day_idx = self._day_idx.tolist()
+        slot_idx = self._slot_idx.tolist()
+        day_schedules = [self.schedule[day] for day in self._days]
+
+        for i, item in enumerate(self._ranked):
+            task_data = item.task_data
             scheduled_task = ScheduledTask(
                 task_id=task_data['id'],
                 name=task_data['name'],
                 duration=task_data['duration'],
                 priority=task_data['priority'],
-                due_date=task_data.get('due_date'),
-                scheduled_date=target_date,
-                scheduled_slot=preferred_slot,
-                urgency_score=score,
-                is_recurring_instance=task_data.get('is_recurring_instance', False),
-                original_task_id=task_data.get('original_task_id'),
-                energy_level=task_data.get('energy_level', 'medium'),
-                time_preference=task_data.get('time_preference', 'anytime')
+                due_date=task_data['due_date'],
+                scheduled_date=self._days[day_idx[i]],
+                scheduled_slot=item.preferred_slot,
+                urgency_score=item.score,
+                is_recurring_instance=task_data['is_recurring_instance'],
+                original_task_id=task_data['original_task_id'],
+                energy_level=task_data['energy_level'],
+                time_preference=task_data['time_preference']
             )
+            scheduled_tasks.append(scheduled_task)
 
-            allocated = False
-
-            # Try preferred slot on target date first
-            if target_date in self.schedule:
-                day_schedule = self.schedule[target_date]
-                slot = day_schedule.get_slot(preferred_slot)
-                if slot and slot.add_task(scheduled_task):
-                    scheduled_task.scheduled_slot = preferred_slot
-                    allocated = True
-
-            # Try other slots on same day
-            if not allocated and target_date in self.schedule:
-                day_schedule = self.schedule[target_date]
-                for slot_name in ['morning', 'afternoon', 'evening']:
-                    if slot_name != preferred_slot:
-                        slot = day_schedule.get_slot(slot_name)
-                        if slot and slot.add_task(scheduled_task):
-                            scheduled_task.scheduled_slot = slot_name
-                            allocated = True
-                            break
-
-            # For urgent/emergency tasks, try earlier days
-            if not allocated and task_data.get('priority') in ['urgent', 'emergency']:
-                for day_offset in range((target_date - self.start_date).days):
-                    earlier_date = self.start_date + timedelta(days=day_offset)
-                    if earlier_date in self.schedule:
-                        day_schedule = self.schedule[earlier_date]
-                        for slot_name in ['morning', 'afternoon', 'evening']:
-                            slot = day_schedule.get_slot(slot_name)
-                            if slot and slot.add_task(scheduled_task):
-                                scheduled_task.scheduled_date = earlier_date
-                                scheduled_task.scheduled_slot = slot_name
-                                allocated = True
-                                break
-                    if allocated:
-                        break
-
-            # Add to overflow if still not allocated
-            if not allocated:
-                if target_date in self.schedule:
-                    self.schedule[target_date].overflow.append(scheduled_task)
-                else:
-                    # Target date outside horizon, add to first day overflow
-                    self.schedule[self.start_date].overflow.append(scheduled_task)
-
-    def _resolve_conflicts(self):
-        """Handle overflowed tasks by trying to reschedule to future days"""
-
-        for current_date in sorted(self.schedule.keys()):
-            day_schedule = self.schedule[current_date]
-            overflow = day_schedule.overflow.copy()
+            # Tasks that fit first time go in now; overflow keeps ranking order
+            if slot_idx[i] < 0:
+                day_schedules[day_idx[i]].overflow.append(scheduled_task)
+            elif i not in moved:
+                self._place(scheduled_task, day_schedules[day_idx[i]], slot_idx[i])
 
-            if not overflow:
-                continue
+        # Tasks pushed forward from overflow land after the first-pass tasks
+        for i in self._moved.tolist():
+            self._place(scheduled_tasks[i], day_schedules[day_idx[i]], slot_idx[i])
 
-            for task in overflow:
-                # Try to push to future days (within 7 days)
-                for future_offset in range(1, min(8, self.horizon)):
-                    future_date = current_date + timedelta(days=future_offset)
-                    if future_date not in self.schedule:
-                        continue
+    def _place(self, scheduled_task: ScheduledTask, day_schedule: DaySchedule, slot_code: int):
+        """Append a task to the slot of day_schedule its placement chose"""
+        slot = day_schedule.slots[slot_code]
+        scheduled_task.scheduled_slot = slot.slot.label
+        slot.add_task(scheduled_task)
 
-                    future_schedule = self.schedule[future_date]
-                    allocated = False
+    def find_task(self, task_id: str) -> Optional[Tuple[date, str, int]]:
+        """
+        Look up where a task landed in the generated schedule.
 
-                    for slot_name in ['morning', 'afternoon', 'evening']:
-                        slot = future_schedule.get_slot(slot_name)
-                        if slot and slot.add_task(task):
-                            task.scheduled_date = future_date
-                            task.scheduled_slot = slot_name
-                            day_schedule.overflow.remove(task)
-                            allocated = True
-                            break
+        Args:
+            task_id: ID of the scheduled task (or recurring instance)
 
-                    if allocated:
-                        break
+        Returns:
+            (date, slot name, position within the slot), or None if the task
+            was not placed in any slot
+        """
+        return self._position_index.get(task_id)
+
+    def _build_position_index(self):
+        """Index every placed task by ID for find_task"""
+        index = {}
+        for day in self._days:
+            day_schedule = self.schedule[day]
+            for slot in day_schedule.slots:
+                for position, task in enumerate(slot.tasks):
+                    index.setdefault(task.task_id, (day, slot.slot.label, position))
+        self._position_index = index
 
     def _generate_output(self) -> Dict[str, Any]:
         """Generate the final schedule output"""
+        self._build_position_index()
 
-        schedule_output = {}
-        total_tasks = 0
-        total_overflow = 0
-        total_minutes = 0
-
-        for day, day_schedule in sorted(self.schedule.items()):
-            schedule_output[day.isoformat()] = day_schedule.to_dict()
-            total_tasks += len(day_schedule.all_tasks)
-            total_overflow += len(day_schedule.overflow)
-            total_minutes += day_schedule.total_scheduled_minutes
+        schedule_output = {
+            day_key: self.schedule[day].to_dict(day_key)
+            for day, day_key in zip(self._days, self._day_keys)
+        }
 
-        # Generate summary and insights
-        insights = self._generate_insights()
+        # Generate summary and insights from one (day, slot) snapshot
+        used, capacity, task_counts, overflow_counts = self._slot_arrays()
+        total_tasks = int(task_counts.sum())
+        total_overflow = int(overflow_counts.sum())
+        total_minutes = int(used.sum())
+        insights = self._generate_insights(used, capacity, task_counts, overflow_counts)
 
         return {
             'schedule': schedule_output,
             'summary': {
                 'start_date': self.start_date.isoformat(),
-                'end_date': (self.start_date + timedelta(days=self.horizon - 1)).isoformat(),
+                'end_date': self.end_date.isoformat(),
                 'planning_horizon_days': self.horizon,
                 'total_tasks_scheduled': total_tasks,
                 'total_tasks_overflow': total_overflow,
@@ -730,15 +947,51 @@ class TaskScheduler:
             'insights': insights
         }
 
-    def _generate_insights(self) -> List[str]:
+    def _slot_arrays(self) -> tuple:
+        """
+        Snapshot the schedule as per-(day, slot) arrays in horizon order.
+
+        Returns:
+            (used, capacity, task_counts, overflow_counts): int32 arrays of
+            scheduled and available minutes shaped (days, 3) with slots in
+            morning/afternoon/evening order, plus per-day task and overflow counts
+        """
+        days = len(self._days)
+        used = np.zeros((days, 3), dtype=np.int32)
+        capacity = np.zeros((days, 3), dtype=np.int32)
+        task_counts = np.zeros(days, dtype=np.int32)
+        overflow_counts = np.zeros(days, dtype=np.int32)
+
+        for i, day in enumerate(self._days):
+            day_schedule = self.schedule[day]
+            for j, slot in enumerate(day_schedule.slots):
+                used[i, j] = slot.used_minutes
+                capacity[i, j] = slot.capacity
+                task_counts[i] += len(slot.tasks)
+            overflow_counts[i] = len(day_schedule.overflow)
+
+        return used, capacity, task_counts, overflow_counts
+
+    def _generate_insights(
+        self,
+        used: np.ndarray,
+        capacity: np.ndarray,
+        task_counts: np.ndarray,
+        overflow_counts: np.ndarray
+    ) -> List[str]:
         """Generate scheduling insights and recommendations"""
         insights = []
 
         # Calculate statistics
-        total_overflow = sum(len(day.overflow) for day in self.schedule.values())
-        total_tasks = sum(len(day.all_tasks) for day in self.schedule.values())
-        high_utilization_days = sum(1 for day in self.schedule.values() if day.utilization > 80)
-        low_utilization_days = sum(1 for day in self.schedule.values() if day.utilization < 30)
+        total_overflow = int(overflow_counts.sum())
+        total_tasks = int(task_counts.sum())
+        daily_used = used.sum(axis=1)
+        daily_capacity = capacity.sum(axis=1)
+        utilization = np.zeros(len(daily_used))
+        np.divide(daily_used, daily_capacity, out=utilization, where=daily_capacity > 0)
+        utilization *= 100
+        high_utilization_days = int((utilization > 80).sum())
+        low_utilization_days = int((utilization < 30).sum())
 
         # Overflow warning
         if total_overflow > 0:
@@ -761,8 +1014,8 @@ class TaskScheduler:
             insights.append(f"🚨 {urgent_count} urgent/emergency tasks ({round(urgent_count/total_tasks*100)}%). Consider reviewing priorities.")
 
         # Morning load
-        morning_minutes = sum(day.morning.total_minutes for day in self.schedule.values())
-        total_minutes = sum(day.total_scheduled_minutes for day in self.schedule.values())
+        morning_minutes = int(used[:, 0].sum())
+        total_minutes = int(daily_used.sum())
         if total_minutes > 0 and morning_minutes / total_minutes > 0.5:
             insights.append("☀️ Heavy morning workload. High-energy tasks are well-positioned for peak productivity.")
 
@@ -795,7 +1048,8 @@ def generate_schedule_from_queryset(
     Returns:
         Complete schedule dictionary
     """
-    tasks = list(queryset)
+    # Plain rows instead of model instances; TaskScheduler accepts both
+    tasks = list(queryset.values(*SCHEDULER_TASK_FIELDS))
     scheduler = TaskScheduler(
         tasks=tasks,
         start_date=start_date,
@@ -0,0 +1,237 @@
+# tasks_api/agents/scheduler_kernels.py
+
+"""
+Compiled scoring and placement kernels for the task scheduler.
+
+Urgency scoring and best-fit slot placement run over int-encoded task
+attributes so they can be compiled with Numba. Without Numba, scoring runs
+as NumPy array expressions and placement as the same loop in Python.
+"""
+
+import numpy as np
+
+# Numba imports
+NUMBA_AVAILABLE = False
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    njit = None
+
+
+# Energy codes; UNKNOWN_ENERGY covers labels outside the table
+ENERGY_CODES = {'high': 0, 'medium': 1, 'low': 2}
+UNKNOWN_ENERGY = 3
+
+# Time preference outcome codes for a task in its chosen slot
+PREF_MISMATCH = 0
+PREF_MATCH = 1
+PREF_ANYTIME = 2
+
+# Time preference factor indexed by outcome code
+PREF_FACTORS = np.array([30.0, 100.0, 80.0])
+
+
+def _urgency_scores_numpy(deadline, priority, task_energy, slot_energy,
+                          pref_match, energy_table, pref_factors, weights):
+    """Weighted urgency per task as NumPy array expressions"""
+    return (
+        deadline * weights[0]
+        + priority * weights[1]
+        + energy_table[slot_energy, task_energy] * weights[2]
+        + pref_factors[pref_match] * weights[3]
+    )
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _urgency_kernel(deadline, priority, task_energy, slot_energy,
+                        pref_match, energy_table, pref_factors, weights):
+        """Weighted urgency per task in one compiled loop"""
+        scores = np.empty(deadline.shape[0])
+        for i in range(deadline.shape[0]):
+            scores[i] = (
+                deadline[i] * weights[0]
+                + priority[i] * weights[1]
+                + energy_table[slot_energy[i], task_energy[i]] * weights[2]
+                + pref_factors[pref_match[i]] * weights[3]
+            )
+        return scores
+
+    # Compile (or load from the on-disk cache) at import so the first
+    # schedule request does not pay for it
+    _urgency_kernel(
+        np.zeros(1), np.zeros(1), np.zeros(1, np.int8), np.zeros(1, np.int8),
+        np.zeros(1, np.int8), np.zeros((4, 4), np.int8), PREF_FACTORS, np.zeros(4),
+    )
+else:
+    _urgency_kernel = _urgency_scores_numpy
+
+
+def urgency_scores(deadline, priority, task_energy, slot_energy,
+                   pref_match, energy_table, weights):
+    """
+    Combine per-task factor arrays into weighted urgency scores.
+
+    Args:
+        deadline: float64 deadline factors
+        priority: float64 priority factors
+        task_energy: int8 ENERGY_CODES of each task (UNKNOWN_ENERGY if unrecognized)
+        slot_energy: int8 ENERGY_CODES of each task's slot
+        pref_match: int8 PREF_* outcome of each task's time preference
+        energy_table: (4, 4) int8 energy factors indexed [slot_energy, task_energy]
+        weights: float64 (deadline, priority, energy, time preference) weights
+
+    Returns:
+        float64 array of urgency scores
+    """
+    return _urgency_kernel(deadline, priority, task_energy, slot_energy,
+                           pref_match, energy_table, PREF_FACTORS, weights)
+
+
+def _best_fit_slot(used, capacity, day, duration, skip):
+    """Slot on day left with the least spare room after adding duration, or -1"""
+    best = -1
+    best_left = 0.0
+    for slot in range(used.shape[1]):
+        if slot == skip:
+            continue
+        room = max(0.0, capacity[day, slot] - used[day, slot])
+        if room >= duration and (best < 0 or room - duration < best_left):
+            best = slot
+            best_left = room - duration
+    return best
+
+
+if NUMBA_AVAILABLE:
+    # Compiled before the kernels below so they call the compiled version
+    _best_fit_slot = njit(cache=True)(_best_fit_slot)
+
+
+def _best_fit_python(durations, target_days, preferred_slots, allow_earlier, used, capacity):
+    """Best-fit placement of tasks (in priority order) into (day, slot) cells"""
+    n_tasks = durations.shape[0]
+    day_idx = np.empty(n_tasks, np.int64)
+    slot_idx = np.full(n_tasks, -1, np.int64)
+
+    for i in range(n_tasks):
+        duration = durations[i]
+        day = target_days[i]
+        preferred = preferred_slots[i]
+        day_idx[i] = day
+
+        # Preferred slot on the target day, then the tightest other slot
+        if preferred >= 0 and max(0.0, capacity[day, preferred] - used[day, preferred]) >= duration:
+            slot_idx[i] = preferred
+        else:
+            slot_idx[i] = _best_fit_slot(used, capacity, day, duration, preferred)
+
+        # Urgent work may move to the tightest slot on the earliest day with room
+        if slot_idx[i] < 0 and allow_earlier[i]:
+            for earlier in range(day):
+                slot_idx[i] = _best_fit_slot(used, capacity, earlier, duration, -1)
+                if slot_idx[i] >= 0:
+                    day_idx[i] = earlier
+                    break
+
+        if slot_idx[i] >= 0:
+            used[day_idx[i], slot_idx[i]] += duration
+
+    return day_idx, slot_idx
+
+
+if NUMBA_AVAILABLE:
+    _best_fit_kernel = njit(cache=True)(_best_fit_python)
+
+    _best_fit_kernel(
+        np.zeros(1), np.zeros(1, np.int64), np.zeros(1, np.int64), np.zeros(1, np.bool_),
+        np.zeros((1, 3)), np.zeros((1, 3)),
+    )
+else:
+    _best_fit_kernel = _best_fit_python
+
+
+def best_fit_placement(durations, target_days, preferred_slots, allow_earlier, used, capacity):
+    """
+    Place tasks greedily into day slots, in the order given.
+
+    Each task takes its preferred slot on its target day when it fits;
+    otherwise the other slot of that day with the least room left over
+    (best fit). Tasks flagged allow_earlier then try earlier days from the
+    start of the horizon, best fit within each day. A slot fits when
+    max(0, capacity - used) >= duration, matching DaySlot.add_task.
+
+    Args:
+        durations: float64 task durations in minutes
+        target_days: int64 day offset each task is aimed at
+        preferred_slots: int64 slot code of each task's preferred slot, -1 for none
+        allow_earlier: bool flags for tasks that may move to earlier days
+        used: float64 (days, slots) scheduled minutes, updated in place
+        capacity: float64 (days, slots) slot capacities
+
+    Returns:
+        (day_idx, slot_idx) int64 arrays; slot_idx is -1 for tasks that did
+        not fit anywhere, whose day_idx stays at the target day
+    """
+    return _best_fit_kernel(durations, target_days, preferred_slots, allow_earlier, used, capacity)
+
+
+def _push_forward_python(durations, day_idx, slot_idx, used, capacity, max_offset):
+    """Move overflowed tasks to the tightest slot that fits on the following days"""
+    n_days = used.shape[0]
+    overflow = np.nonzero(slot_idx < 0)[0]
+    moved = np.empty(overflow.shape[0], np.int64)
+    n_moved = 0
+
+    # Day by day; within a day, overflow is handled in placement order. A
+    # stable sort on the overflow day gives that order in one pass instead
+    # of rescanning every task for each day.
+    for i in overflow[np.argsort(day_idx[overflow], kind='mergesort')]:
+        day = day_idx[i]
+        for offset in range(1, max_offset):
+            future = day + offset
+            if future >= n_days:
+                break
+            slot = _best_fit_slot(used, capacity, future, durations[i], -1)
+            if slot >= 0:
+                day_idx[i] = future
+                slot_idx[i] = slot
+                used[future, slot] += durations[i]
+                moved[n_moved] = i
+                n_moved += 1
+                break
+
+    return moved[:n_moved]
+
+
+if NUMBA_AVAILABLE:
+    _push_forward_kernel = njit(cache=True)(_push_forward_python)
+
+    _push_forward_kernel(
+        np.zeros(1), np.zeros(1, np.int64), np.zeros(1, np.int64),
+        np.zeros((1, 3)), np.zeros((1, 3)), 1,
+    )
+else:
+    _push_forward_kernel = _push_forward_python
+
+
+def push_overflow_forward(durations, day_idx, slot_idx, used, capacity, max_offset):
+    """
+    Retry overflowed tasks on the days after the one they overflowed on.
+
+    Days are processed in order. Each overflowed task (slot_idx -1) moves to
+    the first of the next max_offset - 1 days with room, taking that day's
+    best-fit slot.
+
+    Args:
+        durations: float64 task durations in minutes
+        day_idx: int64 day of each task, updated in place for moved tasks
+        slot_idx: int64 slot of each task (-1 = overflow), updated in place
+        used: float64 (days, slots) scheduled minutes, updated in place
+        capacity: float64 (days, slots) slot capacities
+        max_offset: exclusive bound on how many days ahead a task may move
+
+    Returns:
+        int64 indices of the moved tasks, in the order they were placed
+    """
+    return _push_forward_kernel(durations, day_idx, slot_idx, used, capacity, max_offset)
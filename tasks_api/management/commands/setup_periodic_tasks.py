@@ -5,44 +5,21 @@ from django_celery_beat.models import PeriodicTask, IntervalSchedule, CrontabSch
 import json
 
 class Command(BaseCommand):
-    help = 'Set up periodic tasks for automatic task categorization'
+    help = 'Set up periodic tasks for section maintenance and task categorization'
 
     def handle(self, *args, **options):
         self.stdout.write(
             self.style.SUCCESS('Setting up periodic tasks for task categorization...')
         )
 
-        # Create interval schedule for every hour
-        hourly_schedule, created = IntervalSchedule.objects.get_or_create(
-            every=1,
-            period=IntervalSchedule.HOURS,
-        )
-
-        if created:
-            self.stdout.write(
-                self.style.SUCCESS('Created hourly interval schedule')
-            )
+        # Categorization runs daily at 00:05 from beat_schedule in jarvis_backend/celery.py,
+        # which DatabaseScheduler syncs into its own row. Remove the legacy hourly row so the
+        # full categorization is not also run every hour.
+        deleted, _ = PeriodicTask.objects.filter(name='Categorize tasks by due date').delete()
 
-        # Create periodic task for task categorization (runs every hour)
-        categorize_task, created = PeriodicTask.objects.get_or_create(
-            name='Categorize tasks by due date',
-            defaults={
-                'task': 'tasks_api.tasks.categorize_tasks_by_due_date',
-                'interval': hourly_schedule,
-                'args': json.dumps([]),
-                'kwargs': json.dumps({}),
-                'enabled': True,
-                'description': 'Automatically categorizes tasks based on their due dates - runs every hour',
-            }
-        )
-
-        if created:
-            self.stdout.write(
-                self.style.SUCCESS('Created periodic task: Categorize tasks by due date (hourly)')
-            )
-        else:
+        if deleted:
             self.stdout.write(
-                self.style.WARNING('Periodic task already exists: Categorize tasks by due date')
+                self.style.SUCCESS('Removed legacy hourly periodic task: Categorize tasks by due date')
             )
 
         # Create cron schedule for daily task (every day at midnight)
@@ -92,26 +69,26 @@ class Command(BaseCommand):
                 self.style.SUCCESS('Created 10-second interval schedule for real-time updates')
             )
 
-        # Create real-time task for immediate view updates (ENABLED for production)
-        realtime_task, created = PeriodicTask.objects.get_or_create(
+        # Real-time task for immediate view updates (disabled: edits are handled by post_save signals)
+        realtime_task, created = PeriodicTask.objects.update_or_create(
             name='Real-time task view updates (10 sec)',
             defaults={
                 'task': 'tasks_api.tasks.categorize_tasks_by_due_date',
                 'interval': realtime_schedule,
                 'args': json.dumps([]),
                 'kwargs': json.dumps({}),
-                'enabled': True,  # Enabled for real-time updates
-                'description': 'Real-time task view updates - runs every 10 seconds for immediate today/upcoming categorization',
+                'enabled': False,  # Views are updated on save; enable only as a fallback
+                'description': 'Real-time task view updates - fallback only, runs every 10 seconds when enabled',
             }
         )
 
         if created:
             self.stdout.write(
-                self.style.SUCCESS('Created real-time periodic task: Real-time task view updates (10 sec) - ENABLED')
+                self.style.SUCCESS('Created real-time periodic task: Real-time task view updates (10 sec) - DISABLED')
             )
         else:
             self.stdout.write(
-                self.style.WARNING('Real-time periodic task already exists: Real-time task view updates (10 sec)')
+                self.style.WARNING('Real-time periodic task already exists, now DISABLED: Real-time task view updates (10 sec)')
             )
 
         self.stdout.write('\n' + '='*60)
@@ -119,18 +96,17 @@ class Command(BaseCommand):
             self.style.SUCCESS('Periodic tasks setup complete!')
         )
         self.stdout.write('')
-        self.stdout.write('Created tasks:')
-        self.stdout.write('1. "Categorize tasks by due date" - runs every hour')
+        self.stdout.write('Periodic tasks:')
+        self.stdout.write('1. "categorize-tasks-by-due-date" - runs daily at 00:05 (beat_schedule in jarvis_backend/celery.py)')
         self.stdout.write('2. "Daily section maintenance" - runs daily at midnight')
-        self.stdout.write('3. "Real-time task view updates" - runs every 10 seconds (ENABLED)')
+        self.stdout.write('3. "Real-time task view updates" - every 10 seconds (DISABLED)')
         self.stdout.write('')
-        self.stdout.write('Real-time updates are now ENABLED by default!')
-        self.stdout.write('Tasks will automatically move between Today/Upcoming views every 10 seconds.')
+        self.stdout.write('Task views are updated when tasks are saved, so real-time polling is off.')
         self.stdout.write('')
-        self.stdout.write('To disable real-time updates if needed:')
+        self.stdout.write('To enable real-time updates as a fallback:')
         self.stdout.write('- Go to Django Admin (/admin/)')
         self.stdout.write('- Navigate to Periodic Tasks > Periodic tasks')
-        self.stdout.write('- Find "Real-time task view updates (10 sec)" and disable it')
+        self.stdout.write('- Find "Real-time task view updates (10 sec)" and enable it')
         self.stdout.write('')
         self.stdout.write('To start Celery workers and beat scheduler:')
         self.stdout.write('1. Redis: redis-server (make sure Redis is running)')
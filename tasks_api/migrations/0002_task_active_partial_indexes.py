@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-16 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('totally_completed', False)), fields=['due_date'], name='idx_task_due_active'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('totally_completed', False)), fields=['project'], name='idx_task_project_active'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-16 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_api', '0002_task_active_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='current_view',
+            field=models.CharField(choices=[('calendar', 'Calendar'), ('inbox', 'Inbox'), ('today', 'Today'), ('upcoming', 'Upcoming'), ('overdue', 'Overdue'), ('project', 'Project')], db_index=True, default='inbox', help_text='Primary view of the task, refreshed in bulk by update_task_current_view', max_length=16),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-16 10:35
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_shared_sections(apps, schema_editor):
+    """Fold duplicate shared inbox sections into the oldest one of each name"""
+    Section = apps.get_model('tasks_api', 'Section')
+    SectionView = apps.get_model('tasks_api', 'SectionView')
+    Task = apps.get_model('tasks_api', 'Task')
+
+    shared = Section.objects.filter(project__isnull=True, user__isnull=True)
+    duplicate_names = (
+        shared.values('name').annotate(copies=Count('id')).filter(copies__gt=1).values_list('name', flat=True)
+    )
+    for name in list(duplicate_names):
+        kept, *duplicates = shared.filter(name=name).order_by('created_at', 'id')
+        duplicate_ids = [section.id for section in duplicates]
+
+        Task.objects.filter(section_id__in=duplicate_ids).update(section=kept)
+
+        # Views only the duplicates had move to the kept section; the rest go with them
+        kept_views = set(SectionView.objects.filter(section=kept).values_list('view', flat=True))
+        moved_views = set(
+            SectionView.objects.filter(section_id__in=duplicate_ids).values_list('view', flat=True)
+        ) - kept_views
+        SectionView.objects.bulk_create([SectionView(section=kept, view=view) for view in moved_views])
+
+        Section.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks_api', '0003_task_current_view'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_shared_sections, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='section',
+            constraint=models.UniqueConstraint(condition=models.Q(('project__isnull', True), ('user__isnull', True)), fields=('name',), name='uniq_shared_inbox_section_name'),
+        ),
+    ]
@@ -27,6 +27,14 @@ class Section(BaseModel):
     class Meta:
         ordering = ['name']
         unique_together = ['project', 'name']
+        constraints = [
+            # Shared inbox sections (no owner, no project) are unique by name
+            models.UniqueConstraint(
+                fields=['name'],
+                condition=models.Q(project__isnull=True, user__isnull=True),
+                name='uniq_shared_inbox_section_name',
+            ),
+        ]
         indexes = [
             models.Index(fields=['user']),
             models.Index(fields=['project']),
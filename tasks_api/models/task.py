@@ -3,7 +3,7 @@
 
 from django.db import models
 from django.utils import timezone
-from datetime import date, timedelta
+from datetime import timedelta
 
 from .base import BaseModel
 from .project import Project
@@ -78,6 +78,13 @@ class Task(BaseModel):
     reminder_date = models.DateTimeField(null=True, blank=True)
     completed_date = models.DateTimeField(null=True, blank=True)
     duration_in_minutes = models.PositiveIntegerField(default=15, help_text="Duration in minutes")
+    current_view = models.CharField(
+        max_length=16,
+        choices=VIEW_CHOICES,
+        default='inbox',
+        db_index=True,
+        help_text="Primary view of the task, refreshed in bulk by update_task_current_view"
+    )
     repeat = models.CharField(
         max_length=12,
         choices=REPEAT_CHOICES,
@@ -103,6 +110,17 @@ class Task(BaseModel):
             models.Index(fields=['due_date']),
             models.Index(fields=['completed']),
             models.Index(fields=['priority']),
+            # Partial indexes for the active-task date buckets and project counts
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(totally_completed=False),
+                name='idx_task_due_active',
+            ),
+            models.Index(
+                fields=['project'],
+                condition=models.Q(totally_completed=False),
+                name='idx_task_project_active',
+            ),
         ]
 
     def __str__(self):
@@ -137,10 +155,18 @@ class Task(BaseModel):
         """Check if a user is assigned to this task."""
         return self.assigned_to.filter(id=user.id).exists()
 
-    def calculate_views_from_due_date(self):
-        """Calculate current_view based on due_date and project_id automatically."""
+    def calculate_views_from_due_date(self, today=None, upcoming_end=None):
+        """Calculate current_view based on due_date and project_id automatically.
+
+        Batch callers pass ``today`` and ``upcoming_end`` so every task is
+        bucketed against the same day; by default the current local date and
+        the 14 days after it are used.
+        """
         views = []
-        today = date.today()
+        if today is None:
+            today = timezone.localdate()
+        if upcoming_end is None:
+            upcoming_end = today + timedelta(days=14)
 
         # Base view determination
         if self.project_id:
@@ -158,18 +184,18 @@ class Task(BaseModel):
             # Check if due today
             elif self.due_date == today:
                 views.append('today')
-            else:
-                # Check if due in upcoming range (current day to current day + 14)
-                upcoming_start = today
-                upcoming_end = today + timedelta(days=14)
-
-                if upcoming_start <= self.due_date <= upcoming_end:
-                    views.append('upcoming')
+            # Check if due in upcoming range (current day to upcoming_end)
+            elif self.due_date <= upcoming_end:
+                views.append('upcoming')
 
         return views
 
-    def update_task_views(self):
-        """Update TaskView relationships based on calculated views."""
+    def update_task_views(self, created=False):
+        """Update TaskView relationships based on calculated views.
+
+        The resulting view set is kept on ``_auto_views``. A freshly
+        ``created`` task has no views yet, so the lookup is skipped.
+        """
         # Import here to avoid circular import
         from .task_views import TaskView
 
@@ -177,25 +203,33 @@ class Task(BaseModel):
         calculated_views = self.calculate_views_from_due_date()
 
         # Get current views
-        current_views = list(self.task_views.values_list('view', flat=True))
+        current_views = set() if created else set(self.task_views.values_list('view', flat=True))
 
         # Add missing views
-        for view in calculated_views:
-            if view not in current_views:
-                TaskView.objects.get_or_create(task=self, view=view)
+        missing_views = [view for view in calculated_views if view not in current_views]
+        if missing_views:
+            TaskView.objects.bulk_create(
+                [TaskView(task=self, view=view) for view in missing_views],
+                ignore_conflicts=True
+            )
 
         # Remove outdated views (except when task is completed in a specific section)
         # Keep views that are still valid or if task is completed and in a completed section
-        for view in current_views:
-            if view not in calculated_views:
-                # Don't remove view if task is completed and in a completed section of that view
-                if not (self.completed and self.section and
-                       self.section.name == 'Completed' and
-                       view in ['today', 'upcoming', 'inbox', 'project']):
-                    TaskView.objects.filter(task=self, view=view).delete()
+        outdated_views = current_views.difference(calculated_views)
+        if (outdated_views and self.completed and self.section and
+                self.section.name == 'Completed'):
+            # Don't remove view if task is completed and in a completed section of that view
+            outdated_views -= {'today', 'upcoming', 'inbox', 'project'}
+        if outdated_views:
+            TaskView.objects.filter(task=self, view__in=outdated_views).delete()
+
+        self._auto_views = current_views.union(missing_views).difference(outdated_views)
 
     def save(self, *args, **kwargs):
-        """Override save to handle completion date, section detachment, and auto-update views."""
+        """Override save to handle completion date and section detachment.
+
+        Views are kept in sync by the post_save handler in tasks_api.signals.
+        """
         if self.completed and not self.completed_date:
             self.completed_date = timezone.now()
         elif not self.completed:
@@ -205,10 +239,16 @@ class Task(BaseModel):
         if self.totally_completed:
             self.section = None
 
-        # Save first to ensure the task has an ID
-        super().save(*args, **kwargs)
+        # Date bucket when there is one, otherwise inbox/project
+        self.current_view = self.calculate_views_from_due_date()[-1]
 
-        # Auto-update views based on due_date and project_id
-        # Only update views if task is not totally completed
-        if not self.totally_completed:
-            self.update_task_views()
+        # A partial save touching view inputs must also write the new view,
+        # or the column falls behind the signal-updated TaskView rows
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            # Imported here to avoid a circular import
+            from ..signals import VIEW_FIELDS
+            if VIEW_FIELDS.intersection(update_fields):
+                kwargs['update_fields'] = {*update_fields, 'current_view'}
+
+        super().save(*args, **kwargs)
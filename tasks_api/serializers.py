@@ -159,20 +159,20 @@ class TaskSerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         data['id'] = str(instance.id)
 
-        # Convert user_id to string
-        if instance.user:
-            data['user_id'] = str(instance.user.id)
+        # Convert user_id to string (read the raw FK columns, no related fetch)
+        if instance.user_id:
+            data['user_id'] = str(instance.user_id)
         else:
             data['user_id'] = None
 
         # Convert UUID foreign keys to strings
-        if instance.project:
-            data['project_id'] = str(instance.project.id)
+        if instance.project_id:
+            data['project_id'] = str(instance.project_id)
         else:
             data['project_id'] = None
 
-        if instance.section:
-            data['section_id'] = str(instance.section.id)
+        if instance.section_id:
+            data['section_id'] = str(instance.section_id)
         else:
             data['section_id'] = None
 
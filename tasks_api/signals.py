@@ -0,0 +1,38 @@
+# tasks_api/signals.py
+"""Signal handlers for tasks_api models."""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Project, Task
+
+
+# Fields that influence which views a task belongs to
+VIEW_FIELDS = frozenset({
+    'due_date', 'project', 'project_id', 'section', 'section_id',
+    'completed', 'totally_completed',
+})
+
+
+@receiver(post_save, sender=Task)
+def update_task_views_on_save(sender, instance, created, update_fields=None, **kwargs):
+    """Recalculate the views of a saved task when a view-relevant field changed."""
+    if instance.totally_completed:
+        return
+    if update_fields is not None and not VIEW_FIELDS.intersection(update_fields):
+        return
+    instance.update_task_views(created=created)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_ids_cache(sender, **kwargs):
+    """Drop the cached project id list used for task counts.
+
+    The list lives in the shared cache, so the key is dropped again after
+    commit; another process may have re-cached the old list in between.
+    """
+    cache.delete('projects:ids')
+    transaction.on_commit(lambda: cache.delete('projects:ids'))
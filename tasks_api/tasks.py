@@ -1,16 +1,23 @@
 # File: tasks_api/tasks.py
 
-from celery import shared_task
+from celery import current_app, shared_task
 from celery.utils.log import get_task_logger
+from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
+from django.db.models import Case, CharField, Count, Exists, Max, OuterRef, Prefetch, Q, Value, When
 from django.utils import timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import json
 import traceback
-from datetime import timedelta
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+from datetime import date, timedelta
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 
-from .models import Task, Project, Section
+from .models import Task, Project, Section, SectionView, TaskView
 from .agents.task_agent import TaskAgent
 from .serializers import TaskSerializer
 from .utils.notifications import NotificationService
@@ -67,26 +74,49 @@ def process_ai_intention(
             processed_data = _fallback_processing(intention, user_id)
         
         # Create tasks in database
-        created_tasks = []
+        tasks_data = processed_data.get('tasks', [])
         with transaction.atomic():
-            for task_data in processed_data.get('tasks', []):
-                task = _create_task_from_ai_data(task_data, user_id)
-                created_tasks.append(task)
-                
-                # Schedule recurring tasks if needed
-                if task_data.get('recurring'):
-                    schedule_recurring_task.delay(
-                        task_id=task.id,
-                        pattern=task_data['recurring']
-                    )
+            # Resolve all projects/sections for the batch in a few queries
+            projects_by_name, sections_by_key = _resolve_projects_and_sections(
+                tasks_data, user_id
+            )
+            instances = [
+                _build_task_instance(task_data, user_id, projects_by_name, sections_by_key)
+                for task_data in tasks_data
+            ]
+
+            # bulk_create bypasses Task.save(), so set up views here
+            views_by_task = []
+            for task in instances:
+                views = task.calculate_views_from_due_date()
+                task.current_view = views[-1]
+                views_by_task.append(views)
+
+            created_tasks = Task.objects.bulk_create(instances, batch_size=500)
+            TaskView.objects.bulk_create(
+                [
+                    TaskView(task=task, view=view)
+                    for task, views in zip(created_tasks, views_by_task)
+                    for view in views
+                ],
+                batch_size=500
+            )
+
+        # Schedule recurring tasks if needed
+        follow_ups = [
+            (schedule_recurring_task, (), {'task_id': task.id, 'pattern': task_data['recurring']})
+            for task, task_data in zip(created_tasks, tasks_data)
+            if task_data.get('recurring')
+        ]
         
         # Store insights asynchronously
         if processed_data.get('insights'):
-            store_ai_insights.delay(
-                user_id=user_id,
-                insights=processed_data['insights'],
-                session_id=session_id
-            )
+            follow_ups.append((store_ai_insights, (), {
+                'user_id': user_id,
+                'insights': processed_data['insights'],
+                'session_id': session_id
+            }))
+        enqueue_bulk(follow_ups)
         
         # Prepare response
         result = {
@@ -143,7 +173,10 @@ def schedule_recurring_task(task_id: int, pattern: Dict[str, Any]) -> None:
         pattern: Recurrence pattern (daily, weekly, custom)
     """
     try:
-        task = Task.objects.get(id=task_id)
+        # Only the copied columns are loaded; related rows are referenced by id
+        task = Task.objects.only(
+            'id', 'user_id', 'project_id', 'section_id', 'name', 'description', 'priority'
+        ).get(id=task_id)
         
         # Parse recurrence pattern
         frequency = pattern.get('frequency', 'daily')
@@ -151,6 +184,8 @@ def schedule_recurring_task(task_id: int, pattern: Dict[str, Any]) -> None:
         
         # Generate future instances
         current_date = timezone.now().date()
+        instances = []
+        views_by_task = []
         for i in range(1, count + 1):
             if frequency == 'daily':
                 next_date = current_date + timedelta(days=i)
@@ -161,17 +196,32 @@ def schedule_recurring_task(task_id: int, pattern: Dict[str, Any]) -> None:
                 interval = pattern.get('interval', 1)
                 next_date = current_date + timedelta(days=i * interval)
             
-            # Create scheduled instance
-            Task.objects.create(
+            # Build scheduled instance
+            instance = Task(
                 user_id=task.user_id,
                 project_id=task.project_id,
                 section_id=task.section_id,
-                title=task.title,
+                name=task.name,
                 description=task.description,
                 due_date=next_date,
-                priority=task.priority,
-                parent_task_id=task.id,
-                is_recurring_instance=True
+                priority=task.priority
+            )
+            
+            # bulk_create bypasses Task.save(), so set up views here
+            views = instance.calculate_views_from_due_date()
+            instance.current_view = views[-1]
+            instances.append(instance)
+            views_by_task.append(views)
+        
+        with transaction.atomic():
+            created_tasks = Task.objects.bulk_create(instances, batch_size=500)
+            TaskView.objects.bulk_create(
+                [
+                    TaskView(task=instance, view=view)
+                    for instance, views in zip(created_tasks, views_by_task)
+                    for view in views
+                ],
+                batch_size=500
             )
         
         logger.info(f"Scheduled {count} recurring instances for task {task_id}")
@@ -361,38 +411,105 @@ def _fallback_processing(intention: str, user_id: int) -> Dict[str, Any]:
         'confidence': 0.3
     }
 
-def _create_task_from_ai_data(task_data: Dict[str, Any], user_id: int) -> Task:
-    """Create task instance from AI-processed data"""
-    # Get or create project
-    project_name = task_data.get('project', 'Inbox')
-    project, _ = Project.objects.get_or_create(
-        user_id=user_id,
-        name=project_name,
-        defaults={'color': '#808080'}
-    )
+def enqueue_bulk(tasks: List[Tuple[Any, tuple, Dict[str, Any]]]) -> None:
+    """
+    Publish several Celery tasks over a single broker connection.
     
-    # Get or create section
+    Args:
+        tasks: (task, args, kwargs) tuples to enqueue
+    """
+    if not tasks:
+        return
+    with current_app.producer_or_acquire() as producer:
+        for task, args, kwargs in tasks:
+            task.apply_async(args=args, kwargs=kwargs, producer=producer)
+
+def _resolve_projects_and_sections(
+    tasks_data: List[Dict[str, Any]],
+    user_id: int
+) -> Tuple[Dict[str, Project], Dict[Tuple[Any, str], Section]]:
+    """
+    Get or create every project and section referenced by an AI batch.
+
+    Issues a fixed number of queries regardless of batch size instead of
+    one get_or_create pair per task.
+
+    Args:
+        tasks_data: AI-processed task dictionaries
+        user_id: ID of the user owning the projects
+
+    Returns:
+        Tuple of (projects keyed by name, sections keyed by (project_id, name))
+    """
+    project_names = {td.get('project', 'Inbox') for td in tasks_data}
+    projects_by_name = {
+        p.name: p
+        for p in Project.objects.filter(user_id=user_id, name__in=project_names)
+    }
+
+    # Project has no unique (user, name) constraint, so only insert the
+    # names that are actually missing; UUID keys are assigned client-side.
+    missing_projects = [
+        Project(user_id=user_id, name=name, color='#808080')
+        for name in project_names - projects_by_name.keys()
+    ]
+    if missing_projects:
+        Project.objects.bulk_create(missing_projects)
+        projects_by_name.update((p.name, p) for p in missing_projects)
+
+    section_keys = {
+        (projects_by_name[td.get('project', 'Inbox')].id, td['section'])
+        for td in tasks_data
+        if td.get('section')
+    }
+    sections_by_key = {}
+    if section_keys:
+        # (project, name) is unique, so concurrent batches cannot duplicate
+        Section.objects.bulk_create(
+            [Section(project_id=pid, name=name) for pid, name in section_keys],
+            ignore_conflicts=True
+        )
+        sections = Section.objects.filter(
+            project_id__in={pid for pid, _ in section_keys},
+            name__in={name for _, name in section_keys}
+        )
+        sections_by_key = {(s.project_id, s.name): s for s in sections}
+
+    return projects_by_name, sections_by_key
+
+# AI/fallback priority (1-5, as in _fallback_processing) -> Task.priority;
+# labels that are already valid choices pass through
+_AI_PRIORITY_LABELS = {
+    1: 'low', 2: 'medium', 3: 'high', 4: 'urgent', 5: 'emergency',
+    **{label: label for label, _ in Task.PRIORITY_CHOICES},
+}
+
+def _build_task_instance(
+    task_data: Dict[str, Any],
+    user_id: int,
+    projects_by_name: Dict[str, Project],
+    sections_by_key: Dict[Tuple[Any, str], Section]
+) -> Task:
+    """Build an unsaved task instance from AI-processed data"""
+    project = projects_by_name[task_data.get('project', 'Inbox')]
+
     section = None
     if task_data.get('section'):
-        section, _ = Section.objects.get_or_create(
-            project=project,
-            name=task_data['section']
-        )
-    
-    # Create task
-    return Task.objects.create(
+        section = sections_by_key[(project.id, task_data['section'])]
+
+    task = Task(
         user_id=user_id,
         project=project,
         section=section,
-        title=task_data['title'],
+        name=task_data['title'],
         description=task_data.get('description', ''),
-        priority=task_data.get('priority', 2),
-        due_date=task_data.get('due_date'),
-        labels=task_data.get('labels', []),
-        estimated_duration=task_data.get('duration'),
-        ai_generated=True,
-        ai_confidence=task_data.get('confidence', 1.0)
+        priority=_AI_PRIORITY_LABELS.get(task_data.get('priority'), 'medium'),
+        # due_date is required; undated AI tasks land on today
+        due_date=task_data.get('due_date') or timezone.now().date()
     )
+    if task_data.get('duration'):
+        task.duration_in_minutes = task_data['duration']
+    return task
 
 def _get_preferred_categories(user_id: int) -> List[str]:
     """Get user's most used categories"""
@@ -455,4 +572,282 @@ def analyze_user_patterns(
 
     except Exception as e:
         logger.error(f"Failed to analyze patterns: {str(e)}")
-        return {'error': str(e), 'patterns_found': []}
\ No newline at end of file
+        return {'error': str(e), 'patterns_found': []}
+
+
+@lru_cache(maxsize=1)
+def _date_bounds(today_date: date) -> Tuple[date, date]:
+    """
+    Get the upcoming range for a day, shared by all helpers running that day.
+    
+    Args:
+        today_date: Reference date
+        
+    Returns:
+        First and last day of the upcoming range
+    """
+    return today_date, today_date + timedelta(days=14)
+
+def _acquire_lock(key: str, timeout: int) -> Optional[str]:
+    """
+    Take a cache lock shared by all worker processes.
+
+    Args:
+        key: Cache key of the lock
+        timeout: Seconds before an abandoned lock expires
+
+    Returns:
+        Token identifying this holder, or None if the lock is taken
+    """
+    token = uuid.uuid4().hex
+    return token if cache.add(key, token, timeout) else None
+
+def _release_lock(key: str, token: str) -> None:
+    """Release a lock, unless it expired and another run now holds it"""
+    if cache.get(key) == token:
+        cache.delete(key)
+
+@shared_task
+def categorize_tasks_by_due_date() -> str:
+    """
+    Recalculate the date-based views of all active tasks.
+
+    Views are diffed in bulk, so only tasks whose view set changed are
+    rewritten. Returns a short summary of the run.
+    """
+    # Overlapping runs would rewrite the same views; only one may run at a time
+    lock_token = _acquire_lock('lock:categorize', 600)
+    if not lock_token:
+        return "Skipped: already running"
+
+    try:
+        today_date = timezone.localdate()
+        _, upcoming_end = _date_bounds(today_date)
+
+        # Skip the scan when no active task changed since the last run today
+        fingerprint = Task.objects.filter(totally_completed=False).aggregate(
+            last_update=Max('updated_at'), total=Count('id')
+        )
+        last_update = fingerprint['last_update']
+        signature = f"{last_update.isoformat() if last_update else ''}:{fingerprint['total']}:{today_date}"
+        if cache.get('tasks:categorize:sig') == signature:
+            return "No changes since last run"
+
+        # Tasks parked in a Completed section keep their views (see Task.update_task_views)
+        # Only the columns the view calculation reads are loaded; views are prefetched per chunk
+        active_tasks = Task.objects.filter(totally_completed=False).exclude(
+            completed=True, section__name='Completed'
+        ).only('id', 'due_date', 'project_id').prefetch_related(
+            Prefetch('task_views', queryset=TaskView.objects.only('task_id', 'view'))
+        )
+
+        # Only the views that differ are written: removals grouped per view, additions in bulk
+        stale_task_ids = []
+        removals_by_view = defaultdict(list)
+        new_rows = []
+        for task in active_tasks.iterator(chunk_size=2000):
+            new_views = set(task.calculate_views_from_due_date(today_date, upcoming_end))
+            current_views = {task_view.view for task_view in task.task_views.all()}
+            if new_views == current_views:
+                continue
+            stale_task_ids.append(task.id)
+            for view in current_views - new_views:
+                removals_by_view[view].append(task.id)
+            new_rows.extend(TaskView(task_id=task.id, view=view) for view in new_views - current_views)
+
+        if stale_task_ids:
+            with transaction.atomic():
+                for view, task_ids in removals_by_view.items():
+                    TaskView.objects.filter(task_id__in=task_ids, view=view).delete()
+                TaskView.objects.bulk_create(new_rows, batch_size=1000, ignore_conflicts=True)
+
+            _schedule_task_counts_broadcast()
+
+        cache.set('tasks:categorize:sig', signature, 3600)
+        logger.info(f"Categorized tasks by due date, {len(stale_task_ids)} updated")
+        return f"Updated views for {len(stale_task_ids)} tasks"
+
+    except Exception as e:
+        logger.error(f"Failed to categorize tasks: {str(e)}")
+        raise
+    finally:
+        _release_lock('lock:categorize', lock_token)
+
+def calculate_task_counts() -> Dict[str, Any]:
+    """
+    Calculate navigation counts for all views.
+
+    Returns:
+        Counts per view plus active task counts per project
+    """
+    today_date = timezone.localdate()
+    upcoming_start, upcoming_end = _date_bounds(today_date)
+
+    # Inbox: tasks with inbox view BUT NOT project view
+    inbox_only = Exists(
+        TaskView.objects.filter(task=OuterRef('pk'), view='inbox')
+    ) & ~Exists(
+        TaskView.objects.filter(task=OuterRef('pk'), view='project')
+    )
+    active = Q(totally_completed=False)
+
+    counts = Task.objects.aggregate(
+        inbox=Count('id', filter=active & inbox_only),
+        today=Count('id', filter=active & Q(due_date=today_date)),
+        upcoming=Count('id', filter=active & Q(due_date__range=(upcoming_start, upcoming_end))),
+        overdue=Count('id', filter=active & Q(due_date__lt=today_date)),
+        completed=Count('id', filter=Q(totally_completed=True)),
+    )
+
+    counts_by_project = dict(
+        Task.objects.filter(totally_completed=False)
+        .exclude(project_id__isnull=True)
+        .values_list('project_id')
+        .annotate(Count('id'))
+    )
+    # Project ids change rarely; the shared cache entry is invalidated by Project signals
+    project_ids = cache.get_or_set(
+        'projects:ids',
+        lambda: list(Project.objects.values_list('id', flat=True)),
+        60
+    )
+    counts['projects'] = {
+        str(project_id): counts_by_project.get(project_id, 0)
+        for project_id in project_ids
+    }
+    return counts
+
+@shared_task
+def broadcast_task_counts() -> Dict[str, Any]:
+    """
+    Push fresh navigation counts to task count subscribers.
+
+    Returns:
+        The broadcast counts
+    """
+    counts = calculate_task_counts()
+
+    channel_layer = get_channel_layer()
+    if channel_layer:
+        async_to_sync(channel_layer.group_send)(
+            'task_counts',
+            {
+                'type': 'task_counts.update',
+                'counts': counts
+            }
+        )
+    else:
+        logger.warning("Channel layer not configured, task counts not broadcast")
+
+    return counts
+
+def _schedule_task_counts_broadcast() -> None:
+    """Enqueue a debounced broadcast; calls from any process within the window collapse into one"""
+    if cache.add('tasks:broadcast:pending', '1', timeout=1):
+        broadcast_task_counts.apply_async(countdown=0.5)
+
+@shared_task
+def check_and_update_overdue_tasks() -> str:
+    """
+    Move active tasks that became overdue into the overdue view.
+
+    Cheaper than a full categorization run, so it can be scheduled more
+    often. Returns a short summary of the run.
+    """
+    lock_token = _acquire_lock('lock:overdue', 240)
+    if not lock_token:
+        return "Skipped: already running"
+
+    try:
+        today_date = timezone.localdate()
+
+        tasks_to_update = Task.objects.filter(
+            totally_completed=False,
+            due_date__lt=today_date
+        ).exclude(
+            Exists(TaskView.objects.filter(task=OuterRef('pk'), view='overdue'))
+        )
+        target_ids = list(tasks_to_update.values_list('id', flat=True))
+        if not target_ids:
+            return "No tasks became overdue"
+
+        with transaction.atomic():
+            TaskView.objects.bulk_create(
+                [TaskView(task_id=task_id, view='overdue') for task_id in target_ids],
+                ignore_conflicts=True,
+                batch_size=1000
+            )
+            TaskView.objects.filter(
+                task_id__in=target_ids,
+                view__in=['today', 'upcoming']
+            ).delete()
+
+        _schedule_task_counts_broadcast()
+
+        updated_count = len(target_ids)
+        logger.info(f"Marked {updated_count} tasks as overdue")
+        return f"Marked {updated_count} tasks as overdue"
+
+    except Exception as e:
+        logger.error(f"Failed to update overdue tasks: {str(e)}")
+        raise
+    finally:
+        _release_lock('lock:overdue', lock_token)
+
+@shared_task
+def update_task_current_view() -> str:
+    """
+    Refresh the current_view column of all active tasks.
+
+    The date bucket is evaluated by the database in a single UPDATE that
+    only touches rows whose bucket changed. Disabled unless
+    settings.USE_CURRENT_VIEW_FIELD is set. Returns a short summary.
+    """
+    if not getattr(settings, 'USE_CURRENT_VIEW_FIELD', False):
+        return "disabled"
+
+    today_date = timezone.localdate()
+    upcoming_start, upcoming_end = _date_bounds(today_date)
+
+    bucket = Case(
+        When(due_date__lt=today_date, then=Value('overdue')),
+        When(due_date=today_date, then=Value('today')),
+        When(due_date__range=(upcoming_start, upcoming_end), then=Value('upcoming')),
+        When(project__isnull=False, then=Value('project')),
+        default=Value('inbox'),
+        output_field=CharField()
+    )
+    updated_count = Task.objects.filter(
+        totally_completed=False
+    ).exclude(
+        current_view=bucket
+    ).update(current_view=bucket)
+
+    logger.info(f"Updated current view of {updated_count} tasks")
+    return f"Updated current view of {updated_count} tasks"
+
+@shared_task
+def daily_section_maintenance() -> str:
+    """
+    Ensure the shared Today section exists and is attached to the today view.
+
+    Both rows are written with INSERT ... ON CONFLICT DO NOTHING, so the
+    task is idempotent and safe to run concurrently. Returns a short summary.
+    """
+    try:
+        Section.objects.bulk_create(
+            [Section(name='Today', project=None, user=None)],
+            ignore_conflicts=True
+        )
+        section = Section.objects.get(name='Today', project__isnull=True, user__isnull=True)
+        SectionView.objects.bulk_create(
+            [SectionView(section=section, view='today')],
+            ignore_conflicts=True
+        )
+
+        logger.info(f"Daily section maintenance done for section {section.id}")
+        return f"Today section {section.id} is up to date"
+
+    except Exception as e:
+        logger.error(f"Failed daily section maintenance: {str(e)}")
+        raise
@@ -8,8 +8,12 @@ Tests scoring functions, task allocation, conflict resolution, and API endpoints
 import unittest
 from datetime import date, timedelta
 from decimal import Decimal
+from functools import cache
 from unittest.mock import Mock, patch, MagicMock
 import json
+from types import MappingProxyType
+
+import numpy as np
 
 from django.test import TestCase, override_settings
 from django.urls import reverse
@@ -19,6 +23,7 @@ from rest_framework import status
 from .agents.scheduler import (
     TaskScheduler,
     calculate_deadline_factor,
+    calculate_deadline_factors,
     calculate_priority_factor,
     calculate_energy_match,
     calculate_time_preference_match,
@@ -30,170 +35,179 @@ from .agents.scheduler import (
     TimeSlot,
     Priority,
     WEIGHTS,
+    _WEIGHT_VECTOR,
 )
+from .agents.scheduler_kernels import best_fit_placement, push_overflow_forward
+
+
+# Fixed once per run so mock data and assertions agree on the day
+TODAY = date.today()
 
 
 # =============================================================================
 # MOCK DATA FIXTURES
 # =============================================================================
 
+# Built once at import and kept read-only, so every test can share the same
+# fixtures; a test that needs to edit a task must copy it first
+_MOCK_TASKS = tuple(MappingProxyType(task) for task in [
+    # High priority, due today - should be scheduled first
+    {
+        'id': 'task-001',
+        'name': 'Urgent deadline project',
+        'duration_in_minutes': 120,
+        'priority': 'emergency',
+        'due_date': TODAY,
+        'energy_level': 'high',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Medium priority, due tomorrow
+    {
+        'id': 'task-002',
+        'name': 'Prepare presentation',
+        'duration_in_minutes': 90,
+        'priority': 'high',
+        'due_date': TODAY + timedelta(days=1),
+        'energy_level': 'high',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Low priority, due in a week
+    {
+        'id': 'task-003',
+        'name': 'Review documents',
+        'duration_in_minutes': 60,
+        'priority': 'medium',
+        'due_date': TODAY + timedelta(days=7),
+        'energy_level': 'medium',
+        'time_preference': 'afternoon',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Daily recurring task
+    {
+        'id': 'task-004',
+        'name': 'Daily standup',
+        'duration_in_minutes': 15,
+        'priority': 'medium',
+        'due_date': TODAY,
+        'energy_level': 'low',
+        'time_preference': 'morning',
+        'repeat': 'every day',
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Evening task with low energy
+    {
+        'id': 'task-005',
+        'name': 'Read articles',
+        'duration_in_minutes': 30,
+        'priority': 'low',
+        'due_date': TODAY + timedelta(days=3),
+        'energy_level': 'low',
+        'time_preference': 'evening',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Overdue task - should have highest urgency
+    {
+        'id': 'task-006',
+        'name': 'Overdue report',
+        'duration_in_minutes': 60,
+        'priority': 'urgent',
+        'due_date': TODAY - timedelta(days=2),
+        'energy_level': 'high',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # No deadline task
+    {
+        'id': 'task-007',
+        'name': 'Organize files',
+        'duration_in_minutes': 45,
+        'priority': 'low',
+        'due_date': None,
+        'energy_level': 'low',
+        'time_preference': 'anytime',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Weekly recurring task
+    {
+        'id': 'task-008',
+        'name': 'Weekly review',
+        'duration_in_minutes': 60,
+        'priority': 'medium',
+        'due_date': TODAY + timedelta(days=5),
+        'energy_level': 'medium',
+        'time_preference': 'afternoon',
+        'repeat': 'every week',
+        'completed': False,
+        'totally_completed': False,
+    },
+    # Completed task - should be excluded
+    {
+        'id': 'task-009',
+        'name': 'Completed task',
+        'duration_in_minutes': 30,
+        'priority': 'high',
+        'due_date': TODAY,
+        'energy_level': 'medium',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': True,
+        'totally_completed': False,
+    },
+    # Long task that might overflow
+    {
+        'id': 'task-010',
+        'name': 'Deep work session',
+        'duration_in_minutes': 180,
+        'priority': 'high',
+        'due_date': TODAY,
+        'energy_level': 'high',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    },
+])
+
+_OVERLOAD_TASKS = tuple(MappingProxyType(task) for task in [
+    {
+        'id': f'overload-{i}',
+        'name': f'Task {i}',
+        'duration_in_minutes': 120,
+        'priority': 'high',
+        'due_date': TODAY,
+        'energy_level': 'high',
+        'time_preference': 'morning',
+        'repeat': None,
+        'completed': False,
+        'totally_completed': False,
+    }
+    for i in range(10)  # 10 tasks × 120 min = 1200 min, way over daily capacity
+])
+
+
 def get_mock_tasks():
     """Generate a set of mock tasks for testing."""
-    today = date.today()
-
-    return [
-        # High priority, due today - should be scheduled first
-        {
-            'id': 'task-001',
-            'name': 'Urgent deadline project',
-            'duration_in_minutes': 120,
-            'priority': 'emergency',
-            'due_date': today,
-            'energy_level': 'high',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Medium priority, due tomorrow
-        {
-            'id': 'task-002',
-            'name': 'Prepare presentation',
-            'duration_in_minutes': 90,
-            'priority': 'high',
-            'due_date': today + timedelta(days=1),
-            'energy_level': 'high',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Low priority, due in a week
-        {
-            'id': 'task-003',
-            'name': 'Review documents',
-            'duration_in_minutes': 60,
-            'priority': 'medium',
-            'due_date': today + timedelta(days=7),
-            'energy_level': 'medium',
-            'time_preference': 'afternoon',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Daily recurring task
-        {
-            'id': 'task-004',
-            'name': 'Daily standup',
-            'duration_in_minutes': 15,
-            'priority': 'medium',
-            'due_date': today,
-            'energy_level': 'low',
-            'time_preference': 'morning',
-            'repeat': 'every day',
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Evening task with low energy
-        {
-            'id': 'task-005',
-            'name': 'Read articles',
-            'duration_in_minutes': 30,
-            'priority': 'low',
-            'due_date': today + timedelta(days=3),
-            'energy_level': 'low',
-            'time_preference': 'evening',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Overdue task - should have highest urgency
-        {
-            'id': 'task-006',
-            'name': 'Overdue report',
-            'duration_in_minutes': 60,
-            'priority': 'urgent',
-            'due_date': today - timedelta(days=2),
-            'energy_level': 'high',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # No deadline task
-        {
-            'id': 'task-007',
-            'name': 'Organize files',
-            'duration_in_minutes': 45,
-            'priority': 'low',
-            'due_date': None,
-            'energy_level': 'low',
-            'time_preference': 'anytime',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Weekly recurring task
-        {
-            'id': 'task-008',
-            'name': 'Weekly review',
-            'duration_in_minutes': 60,
-            'priority': 'medium',
-            'due_date': today + timedelta(days=5),
-            'energy_level': 'medium',
-            'time_preference': 'afternoon',
-            'repeat': 'every week',
-            'completed': False,
-            'totally_completed': False,
-        },
-        # Completed task - should be excluded
-        {
-            'id': 'task-009',
-            'name': 'Completed task',
-            'duration_in_minutes': 30,
-            'priority': 'high',
-            'due_date': today,
-            'energy_level': 'medium',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': True,
-            'totally_completed': False,
-        },
-        # Long task that might overflow
-        {
-            'id': 'task-010',
-            'name': 'Deep work session',
-            'duration_in_minutes': 180,
-            'priority': 'high',
-            'due_date': today,
-            'energy_level': 'high',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        },
-    ]
+    return _MOCK_TASKS
 
 
 def get_overload_tasks():
     """Generate tasks that will exceed daily capacity."""
-    today = date.today()
-
-    return [
-        {
-            'id': f'overload-{i}',
-            'name': f'Task {i}',
-            'duration_in_minutes': 120,
-            'priority': 'high',
-            'due_date': today,
-            'energy_level': 'high',
-            'time_preference': 'morning',
-            'repeat': None,
-            'completed': False,
-            'totally_completed': False,
-        }
-        for i in range(10)  # 10 tasks × 120 min = 1200 min, way over daily capacity
-    ]
+    return _OVERLOAD_TASKS
 
 
 # =============================================================================
@@ -203,8 +217,7 @@ def get_overload_tasks():
 class TestDeadlineFactorCalculation(unittest.TestCase):
     """Test cases for deadline factor scoring."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_overdue_task_gets_highest_score(self):
         """Overdue tasks should score above 100."""
@@ -262,6 +275,16 @@ class TestDeadlineFactorCalculation(unittest.TestCase):
         # Should be min(150, 100 + 20*5) = min(150, 200) = 150
         self.assertEqual(score, 150.0)
 
+    def test_vectorized_matches_scalar(self):
+        """calculate_deadline_factors should agree with the scalar version."""
+        due_dates = [None] + [self.today + timedelta(days=d) for d in range(-30, 60)]
+        factors = calculate_deadline_factors(due_dates, self.today)
+
+        self.assertEqual(
+            factors.tolist(),
+            [calculate_deadline_factor(d, self.today) for d in due_dates]
+        )
+
 
 class TestPriorityFactorCalculation(unittest.TestCase):
     """Test cases for priority factor scoring."""
@@ -349,13 +372,13 @@ class TestTimePreferenceMatch(unittest.TestCase):
 class TestCombinedUrgencyScore(unittest.TestCase):
     """Test cases for combined urgency score calculation."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_weights_sum_to_one(self):
         """Scoring weights should sum to 1.0."""
         total_weight = sum(WEIGHTS.values())
         self.assertAlmostEqual(total_weight, 1.0, places=5)
+        self.assertAlmostEqual(float(_WEIGHT_VECTOR.sum()), total_weight, places=9)
 
     def test_emergency_overdue_task_has_highest_score(self):
         """Emergency priority overdue task should have very high score."""
@@ -391,6 +414,58 @@ class TestCombinedUrgencyScore(unittest.TestCase):
         # Should be low due to mismatches and low priority
         self.assertLess(score, 40)
 
+    def test_scheduler_batch_scores_match_scalar_formula(self):
+        """Batch kernel scores in the scheduler should equal calculate_urgency_score."""
+        scheduler = TaskScheduler(tasks=get_mock_tasks(), start_date=self.today)
+        one_time, recurring = scheduler._process_tasks()
+
+        for item in scheduler._score_tasks(one_time + recurring):
+            task_data = item.task_data
+            slot = TimeSlot[item.preferred_slot.upper()]
+            expected = calculate_urgency_score(
+                due_date=task_data['due_date'],
+                priority=task_data['priority'],
+                task_energy=task_data['energy_level'],
+                task_time_preference=task_data['time_preference'],
+                slot_name=slot.label,
+                slot_energy=slot.energy_profile,
+                reference_date=self.today
+            )
+            self.assertEqual(item.score, expected)
+
+
+class TestScoringInvariantsOverMockTasks(unittest.TestCase):
+    """Check scoring invariants across all mock tasks at once."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Struct-of-arrays view of the mock data, built once for the class
+        dated = [task for task in _MOCK_TASKS if task['due_date'] is not None]
+        due_dates = np.array([task['due_date'] for task in dated], dtype='datetime64[D]')
+        cls.days_until_due = (due_dates - np.datetime64(TODAY, 'D')).astype(int)
+        cls.deadline_factors = calculate_deadline_factors(
+            [task['due_date'] for task in dated], TODAY
+        )
+        cls.priority_factors = np.array([
+            calculate_priority_factor(task['priority']) for task in _MOCK_TASKS
+        ])
+
+    def test_overdue_tasks_score_above_100(self):
+        """Every overdue mock task should score above 100."""
+        overdue = self.days_until_due < 0
+        self.assertTrue(overdue.any())
+        self.assertTrue(np.all(self.deadline_factors[overdue] > 100))
+
+    def test_deadline_factor_never_rises_with_distance(self):
+        """Later due dates should never score higher than earlier ones."""
+        order = np.argsort(self.days_until_due, kind='stable')
+        self.assertTrue(np.all(np.diff(self.deadline_factors[order]) <= 0))
+
+    def test_priority_factors_within_range(self):
+        """Priority factors should stay within 0-100."""
+        self.assertTrue(np.all((self.priority_factors >= 0) & (self.priority_factors <= 100)))
+
 
 # =============================================================================
 # UNIT TESTS: DATA STRUCTURES
@@ -424,8 +499,8 @@ class TestDaySlot(unittest.TestCase):
             name='Test Task',
             duration=60,
             priority='medium',
-            due_date=date.today(),
-            scheduled_date=date.today(),
+            due_date=TODAY,
+            scheduled_date=TODAY,
             scheduled_slot='morning',
             urgency_score=50.0
         )
@@ -448,18 +523,21 @@ class TestDaySlot(unittest.TestCase):
         task1 = ScheduledTask(
             task_id='t1', name='T1', duration=60,
             priority='medium', due_date=None,
-            scheduled_date=date.today(),
+            scheduled_date=TODAY,
             scheduled_slot='evening', urgency_score=50.0
         )
         task2 = ScheduledTask(
             task_id='t2', name='T2', duration=30,
             priority='medium', due_date=None,
-            scheduled_date=date.today(),
+            scheduled_date=TODAY,
             scheduled_slot='evening', urgency_score=50.0
         )
 
         self.assertTrue(slot.add_task(task1))
         self.assertFalse(slot.add_task(task2))
+        # The rejected task must not count toward the running total
+        self.assertEqual(slot.total_minutes, 60)
+        self.assertEqual(slot.remaining_capacity, 0)
 
 
 class TestDaySchedule(unittest.TestCase):
@@ -467,7 +545,7 @@ class TestDaySchedule(unittest.TestCase):
 
     def test_utilization_calculation(self):
         """Utilization should be calculated correctly."""
-        day = DaySchedule(date=date.today())
+        day = DaySchedule(date=TODAY)
 
         # Total capacity: 180 + 150 + 120 = 450
         self.assertEqual(day.total_capacity, 450)
@@ -476,7 +554,7 @@ class TestDaySchedule(unittest.TestCase):
         task = ScheduledTask(
             task_id='t1', name='Test', duration=90,
             priority='medium', due_date=None,
-            scheduled_date=date.today(),
+            scheduled_date=TODAY,
             scheduled_slot='morning', urgency_score=50.0
         )
         day.morning.add_task(task)
@@ -486,7 +564,7 @@ class TestDaySchedule(unittest.TestCase):
 
     def test_get_slot(self):
         """get_slot should return correct slot."""
-        day = DaySchedule(date=date.today())
+        day = DaySchedule(date=TODAY)
 
         self.assertEqual(day.get_slot('morning'), day.morning)
         self.assertEqual(day.get_slot('afternoon'), day.afternoon)
@@ -501,9 +579,14 @@ class TestDaySchedule(unittest.TestCase):
 class TestTaskSchedulerBasic(unittest.TestCase):
     """Basic integration tests for TaskScheduler."""
 
-    def setUp(self):
-        self.today = date.today()
-        self.mock_tasks = get_mock_tasks()
+    today = TODAY
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The scheduler normalizes inputs into fresh dicts, so the read-only
+        # fixtures can be shared by every test in the class.
+        cls.mock_tasks = get_mock_tasks()
 
     def test_scheduler_initialization(self):
         """Scheduler should initialize correctly."""
@@ -571,6 +654,27 @@ class TestTaskSchedulerBasic(unittest.TestCase):
         # task-009 is completed and should not appear
         self.assertNotIn('task-009', scheduled_ids)
 
+    def test_find_task_matches_schedule_output(self):
+        """find_task should report the date, slot and position shown in the output."""
+        scheduler = TaskScheduler(
+            tasks=self.mock_tasks,
+            start_date=self.today,
+            planning_horizon_days=7
+        )
+
+        result = scheduler.generate_schedule()
+
+        for day_key, day_data in result['schedule'].items():
+            for slot in ['morning', 'afternoon', 'evening']:
+                for position, task in enumerate(day_data[slot]['tasks']):
+                    self.assertEqual(
+                        scheduler.find_task(task['task_id']),
+                        (date.fromisoformat(day_key), slot, position)
+                    )
+
+        # Completed tasks are never placed
+        self.assertIsNone(scheduler.find_task('task-009'))
+
     def test_overdue_tasks_scheduled_first(self):
         """Overdue tasks should be scheduled on the first day."""
         scheduler = TaskScheduler(
@@ -596,8 +700,7 @@ class TestTaskSchedulerBasic(unittest.TestCase):
 class TestTaskSchedulerPriorityOrdering(unittest.TestCase):
     """Test priority-based task ordering."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_higher_priority_scheduled_before_lower(self):
         """Higher priority tasks should generally be scheduled before lower."""
@@ -636,8 +739,8 @@ class TestTaskSchedulerPriorityOrdering(unittest.TestCase):
 
         if len(morning_tasks) >= 2:
             # High priority should have higher urgency score
-            high_idx = next(i for i, t in enumerate(morning_tasks) if t['task_id'] == 'high-priority')
-            low_idx = next(i for i, t in enumerate(morning_tasks) if t['task_id'] == 'low-priority')
+            _, _, high_idx = scheduler.find_task('high-priority')
+            _, _, low_idx = scheduler.find_task('low-priority')
 
             # Emergency task should come before low priority
             self.assertLess(high_idx, low_idx)
@@ -646,8 +749,7 @@ class TestTaskSchedulerPriorityOrdering(unittest.TestCase):
 class TestTaskSchedulerRecurring(unittest.TestCase):
     """Test recurring task expansion."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_daily_recurring_expands_to_all_days(self):
         """Daily recurring task should create instance for each day."""
@@ -717,15 +819,17 @@ class TestTaskSchedulerRecurring(unittest.TestCase):
 class TestTaskSchedulerOverflow(unittest.TestCase):
     """Test overflow handling when daily capacity is exceeded."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.overload_tasks = get_overload_tasks()
 
     def test_overflow_when_exceeds_capacity(self):
         """Tasks exceeding daily capacity should go to overflow."""
-        overload_tasks = get_overload_tasks()
-
         scheduler = TaskScheduler(
-            tasks=overload_tasks,
+            tasks=self.overload_tasks,
             start_date=self.today,
             planning_horizon_days=1
         )
@@ -745,10 +849,8 @@ class TestTaskSchedulerOverflow(unittest.TestCase):
 
     def test_overflow_pushed_to_future_days(self):
         """Overflow tasks should be rescheduled to future days."""
-        overload_tasks = get_overload_tasks()
-
         scheduler = TaskScheduler(
-            tasks=overload_tasks,
+            tasks=self.overload_tasks,
             start_date=self.today,
             planning_horizon_days=7  # More days to absorb overflow
         )
@@ -766,12 +868,47 @@ class TestTaskSchedulerOverflow(unittest.TestCase):
         # Most tasks should be scheduled across multiple days
         self.assertGreater(total_scheduled, 3)
 
+    def test_best_fit_falls_back_to_tightest_slot_and_earlier_days(self):
+        """Placement kernel should try preferred, tightest other, then earlier-day slots."""
+        used = np.zeros((2, 3))
+        capacity = np.array([[60.0, 60.0, 60.0], [60.0, 90.0, 45.0]])
+
+        day_idx, slot_idx = best_fit_placement(
+            np.array([60.0, 40.0, 60.0, 60.0]),
+            np.array([1, 1, 1, 1]),
+            np.array([0, 0, -1, 0]),
+            np.array([False, False, False, True]),
+            used,
+            capacity,
+        )
+
+        # The 40-minute task takes the 45-minute evening over the roomier
+        # afternoon, which the third task then fills; the urgent fourth finds
+        # no room on its day and moves to the earlier one
+        self.assertEqual(day_idx.tolist(), [1, 1, 1, 0])
+        self.assertEqual(slot_idx.tolist(), [0, 2, 1, 0])
+        self.assertEqual(used.tolist(), [[60.0, 0.0, 0.0], [60.0, 60.0, 40.0]])
+
+    def test_push_forward_moves_overflow_to_next_free_day(self):
+        """Overflowed tasks should move to the first later day with room."""
+        used = np.array([[60.0, 60.0, 60.0], [60.0, 60.0, 60.0], [0.0, 0.0, 0.0]])
+        capacity = np.full((3, 3), 60.0)
+        day_idx = np.array([0, 0, 0])
+        slot_idx = np.array([0, -1, -1])
+
+        moved = push_overflow_forward(
+            np.array([60.0, 60.0, 30.0]), day_idx, slot_idx, used, capacity, 8
+        )
+
+        self.assertEqual(moved.tolist(), [1, 2])
+        self.assertEqual(day_idx.tolist(), [0, 2, 2])
+        self.assertEqual(slot_idx.tolist(), [0, 0, 1])
+
 
 class TestTaskSchedulerEnergyMatching(unittest.TestCase):
     """Test energy-based slot assignment."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_high_energy_tasks_prefer_morning(self):
         """High energy tasks should prefer morning slot."""
@@ -794,13 +931,7 @@ class TestTaskSchedulerEnergyMatching(unittest.TestCase):
         result = scheduler.generate_schedule()
 
         # Find where the task was scheduled
-        scheduled_slot = None
-        for day_data in result['schedule'].values():
-            for slot in ['morning', 'afternoon', 'evening']:
-                for task in day_data[slot]['tasks']:
-                    if task['task_id'] == 'high-energy':
-                        scheduled_slot = slot
-                        break
+        _, scheduled_slot, _ = scheduler.find_task('high-energy')
 
         # Should prefer morning for high energy
         self.assertEqual(scheduled_slot, 'morning')
@@ -825,13 +956,7 @@ class TestTaskSchedulerEnergyMatching(unittest.TestCase):
         scheduler = TaskScheduler(tasks=tasks, start_date=self.today, planning_horizon_days=14)
         result = scheduler.generate_schedule()
 
-        scheduled_slot = None
-        for day_data in result['schedule'].values():
-            for slot in ['morning', 'afternoon', 'evening']:
-                for task in day_data[slot]['tasks']:
-                    if task['task_id'] == 'low-energy':
-                        scheduled_slot = slot
-                        break
+        _, scheduled_slot, _ = scheduler.find_task('low-energy')
 
         self.assertEqual(scheduled_slot, 'evening')
 
@@ -839,8 +964,7 @@ class TestTaskSchedulerEnergyMatching(unittest.TestCase):
 class TestTaskSchedulerCustomCapacity(unittest.TestCase):
     """Test custom slot capacity configuration."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_custom_slot_capacities(self):
         """Scheduler should respect custom slot capacities."""
@@ -893,7 +1017,7 @@ class TestGenerateScheduleFromList(unittest.TestCase):
 
         result = generate_schedule_from_list(
             task_list=tasks,
-            start_date=date.today(),
+            start_date=TODAY,
             horizon_days=7
         )
 
@@ -906,11 +1030,16 @@ class TestGenerateScheduleFromList(unittest.TestCase):
 # API ENDPOINT TESTS (Django)
 # =============================================================================
 
+@cache
+def scheduler_url(name):
+    """URL of a scheduler endpoint, reversed once per name (the URLconf isn't ready at import)."""
+    return reverse(f'tasks_api:scheduler-{name}')
+
+
 class TestSchedulerAPIEndpoints(APITestCase):
     """Test scheduler API endpoints."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     @patch('tasks_api.views_scheduler.Task.objects')
     def test_generate_schedule_endpoint(self, mock_task_objects):
@@ -922,7 +1051,7 @@ class TestSchedulerAPIEndpoints(APITestCase):
         mock_task_objects.all.return_value = mock_queryset
         mock_task_objects.filter.return_value = mock_queryset
 
-        url = reverse('tasks_api:scheduler-generate')
+        url = scheduler_url('generate')
         response = self.client.get(url, {'horizon_days': 7})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -938,7 +1067,7 @@ class TestSchedulerAPIEndpoints(APITestCase):
         mock_task_objects.all.return_value = mock_queryset
         mock_task_objects.filter.return_value = mock_queryset
 
-        url = reverse('tasks_api:scheduler-generate')
+        url = scheduler_url('generate')
         data = {
             'start_date': self.today.isoformat(),
             'horizon_days': 14,
@@ -953,15 +1082,57 @@ class TestSchedulerAPIEndpoints(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_generate_schedule_cache_invalidated_by_task_edit(self):
+        """Editing a task should bypass the cached schedule for the same request."""
+        from .models import Task
+
+        task = Task.objects.create(name="Cached Task", due_date=self.today, duration_in_minutes=30)
+        url = scheduler_url('generate')
+        params = {'start_date': self.today.isoformat(), 'horizon_days': 3}
+
+        first = self.client.get(url, params)
+        self.assertEqual(self.client.get(url, params).data, first.data)
+
+        task.name = "Renamed Task"
+        task.save()
+        response = self.client.get(url, params)
+
+        names = [
+            scheduled['name']
+            for slot in ('morning', 'afternoon', 'evening')
+            for scheduled in response.data['schedule'][self.today.isoformat()][slot]['tasks']
+        ]
+        self.assertEqual(names, ["Renamed Task"])
+
+    def test_schedule_preview_cache_picks_up_new_task(self):
+        """Creating a task should bypass the cached preview for the same day."""
+        from .models import Task
+
+        Task.objects.create(name="First Task", due_date=self.today, duration_in_minutes=30)
+        url = scheduler_url('preview')
+        params = {'date': self.today.isoformat()}
+
+        self.client.get(url, params)
+        Task.objects.create(name="Second Task", due_date=self.today, duration_in_minutes=30)
+        response = self.client.get(url, params)
+
+        names = {
+            scheduled['name']
+            for slot in ('morning', 'afternoon', 'evening')
+            for scheduled in response.data['schedule'][slot]['tasks']
+        }
+        self.assertEqual(names, {"First Task", "Second Task"})
+
     @patch('tasks_api.views_scheduler.Task.objects')
     def test_schedule_preview_endpoint(self, mock_task_objects):
         """Test /scheduler/preview/ endpoint."""
         mock_queryset = MagicMock()
         mock_queryset.filter.return_value = mock_queryset
+        mock_queryset.count.return_value = 0
         mock_queryset.__iter__ = lambda self: iter([])
         mock_task_objects.filter.return_value = mock_queryset
 
-        url = reverse('tasks_api:scheduler-preview')
+        url = scheduler_url('preview')
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -970,7 +1141,7 @@ class TestSchedulerAPIEndpoints(APITestCase):
 
     def test_score_task_endpoint(self):
         """Test /scheduler/score/ endpoint."""
-        url = reverse('tasks_api:scheduler-score')
+        url = scheduler_url('score')
         data = {
             'due_date': self.today.isoformat(),
             'priority': 'high',
@@ -994,7 +1165,7 @@ class TestSchedulerAPIEndpoints(APITestCase):
         mock_queryset.__iter__ = lambda self: iter([])
         mock_task_objects.filter.return_value = mock_queryset
 
-        url = reverse('tasks_api:scheduler-workload')
+        url = scheduler_url('workload')
         response = self.client.get(url, {'horizon_days': 7})
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1010,8 +1181,7 @@ class TestSchedulerAPIEndpoints(APITestCase):
 class TestSchedulerEdgeCases(unittest.TestCase):
     """Test edge cases and boundary conditions."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
     def test_empty_task_list(self):
         """Scheduler should handle empty task list."""
@@ -1123,6 +1293,32 @@ class TestSchedulerEdgeCases(unittest.TestCase):
         # Should still be scheduled (0 duration fits anywhere)
         self.assertEqual(result['summary']['total_tasks_scheduled'], 1)
 
+    def test_zero_duration_task_keeps_preferred_slot_when_full(self):
+        """Zero duration tasks should land in their preferred slot even if it is full."""
+        tasks = [
+            {
+                'id': 'fill-morning',
+                'name': 'Deep Work',
+                'duration_in_minutes': 180,
+                'priority': 'high',
+                'due_date': self.today,
+                'time_preference': 'morning',
+            },
+            {
+                'id': 'check-in',
+                'name': 'Check In',
+                'duration_in_minutes': 0,
+                'priority': 'low',
+                'due_date': self.today,
+                'time_preference': 'morning',
+            },
+        ]
+
+        scheduler = TaskScheduler(tasks=tasks, start_date=self.today, planning_horizon_days=1)
+        scheduler.generate_schedule()
+
+        self.assertEqual(scheduler.find_task('check-in'), (self.today, 'morning', 1))
+
     def test_task_with_missing_fields(self):
         """Scheduler should handle tasks with missing optional fields."""
         tasks = [{
@@ -1149,32 +1345,34 @@ class TestSchedulerEdgeCases(unittest.TestCase):
 class TestSchedulerPerformance(unittest.TestCase):
     """Performance tests for scheduler."""
 
-    def setUp(self):
-        self.today = date.today()
+    today = TODAY
 
-    def test_handles_large_task_list(self):
-        """Scheduler should handle large number of tasks efficiently."""
-        # Generate 100 tasks
-        tasks = [
-            {
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # Built once, outside the timed region; read-only like the module fixtures
+        cls.large_tasks = tuple(
+            MappingProxyType({
                 'id': f'task-{i}',
                 'name': f'Task {i}',
                 'duration_in_minutes': 30,
                 'priority': ['low', 'medium', 'high', 'urgent', 'emergency'][i % 5],
-                'due_date': self.today + timedelta(days=i % 14),
+                'due_date': cls.today + timedelta(days=i % 14),
                 'energy_level': ['low', 'medium', 'high'][i % 3],
                 'time_preference': ['morning', 'afternoon', 'evening', 'anytime'][i % 4],
                 'repeat': None,
                 'completed': False,
                 'totally_completed': False,
-            }
+            })
             for i in range(100)
-        ]
+        )
 
+    def test_handles_large_task_list(self):
+        """Scheduler should handle large number of tasks efficiently."""
         import time
         start_time = time.time()
 
-        scheduler = TaskScheduler(tasks=tasks, start_date=self.today, planning_horizon_days=14)
+        scheduler = TaskScheduler(tasks=self.large_tasks, start_date=self.today, planning_horizon_days=14)
         result = scheduler.generate_schedule()
 
         end_time = time.time()
@@ -2,7 +2,6 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from rest_framework_nested import routers as nested_routers
 
 from .views import (
     TaskViewSet,
@@ -86,24 +85,42 @@ router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'projects', ProjectViewSet, basename='project')
 router.register(r'sections', SectionViewSet, basename='section')
 
-# Nested routers for related resources
-projects_router = nested_routers.NestedDefaultRouter(
-    router,
-    r'projects',
-    lookup='project'
-)
-projects_router.register(
-    r'sections',
-    SectionViewSet,
-    basename='project-sections'
-)
+# Extra TaskViewSet/ProjectViewSet action bindings, each built once and
+# referenced by name in the URL groups below
+_task_complete = TaskViewSet.as_view({'post': 'complete'})
+_task_star = TaskViewSet.as_view({'post': 'star'})
+_project_archive = ProjectViewSet.as_view({'post': 'archive'})
+_task_bulk_update = TaskViewSet.as_view({'post': 'bulk_update'})
+_task_bulk_delete = TaskViewSet.as_view({'post': 'bulk_delete'})
+_task_bulk_move = TaskViewSet.as_view({'post': 'bulk_move'})
+_task_search = TaskViewSet.as_view({'get': 'search'})
+_project_search = ProjectViewSet.as_view({'get': 'search'})
+_task_global_search = TaskViewSet.as_view({'get': 'global_search'})
+_task_templates = TaskViewSet.as_view({'get': 'templates'})
+_project_templates = ProjectViewSet.as_view({'get': 'templates'})
+_task_save_as_template = TaskViewSet.as_view({'post': 'save_as_template'})
+_task_import_csv = TaskViewSet.as_view({'post': 'import_csv'})
+_task_import_json = TaskViewSet.as_view({'post': 'import_json'})
+_task_import_todoist = TaskViewSet.as_view({'post': 'import_todoist'})
+_task_export_csv = TaskViewSet.as_view({'get': 'export_csv'})
+_task_export_json = TaskViewSet.as_view({'get': 'export_json'})
+_task_export_pdf = TaskViewSet.as_view({'get': 'export_pdf'})
+_task_create_recurring = TaskViewSet.as_view({'post': 'create_recurring'})
+_task_recurring_patterns = TaskViewSet.as_view({'get': 'recurring_patterns'})
+_task_pause_recurring = TaskViewSet.as_view({'post': 'pause_recurring'})
+_task_start_timer = TaskViewSet.as_view({'post': 'start_timer'})
+_task_stop_timer = TaskViewSet.as_view({'post': 'stop_timer'})
+_task_log_time = TaskViewSet.as_view({'post': 'log_time'})
+_task_time_report = TaskViewSet.as_view({'get': 'time_report'})
+_task_register_webhook = TaskViewSet.as_view({'post': 'register_webhook'})
+_task_list_webhooks = TaskViewSet.as_view({'get': 'list_webhooks'})
+_task_delete_webhook = TaskViewSet.as_view({'delete': 'delete_webhook'})
 
 app_name = 'tasks_api'
 
 urlpatterns = [
     # Include routers
     path('', include(router.urls)),
-    path('', include(projects_router.urls)),
     
     # AI Agent endpoints
     path('ai/', include([
@@ -202,77 +219,65 @@ urlpatterns = [
 
     # Quick actions
     path('quick-actions/', include([
-        path('complete-task/<int:task_id>/', 
-             TaskViewSet.as_view({'post': 'complete'}), 
-             name='quick-complete-task'),
-        path('star-task/<int:task_id>/', 
-             TaskViewSet.as_view({'post': 'star'}), 
-             name='quick-star-task'),
-        path('archive-project/<int:project_id>/', 
-             ProjectViewSet.as_view({'post': 'archive'}), 
-             name='quick-archive-project'),
+        path('complete-task/<int:task_id>/', _task_complete, name='quick-complete-task'),
+        path('star-task/<int:task_id>/', _task_star, name='quick-star-task'),
+        path('archive-project/<int:project_id>/', _project_archive, name='quick-archive-project'),
     ])),
     
     # Bulk operations
     path('bulk/', include([
-        path('tasks/update/', 
-             TaskViewSet.as_view({'post': 'bulk_update'}), 
-             name='bulk-update-tasks'),
-        path('tasks/delete/', 
-             TaskViewSet.as_view({'post': 'bulk_delete'}), 
-             name='bulk-delete-tasks'),
-        path('tasks/move/', 
-             TaskViewSet.as_view({'post': 'bulk_move'}), 
-             name='bulk-move-tasks'),
+        path('tasks/update/', _task_bulk_update, name='bulk-update-tasks'),
+        path('tasks/delete/', _task_bulk_delete, name='bulk-delete-tasks'),
+        path('tasks/move/', _task_bulk_move, name='bulk-move-tasks'),
     ])),
     
     # Search and filters
     path('search/', include([
-        path('tasks/', TaskViewSet.as_view({'get': 'search'}), name='search-tasks'),
-        path('projects/', ProjectViewSet.as_view({'get': 'search'}), name='search-projects'),
-        path('global/', TaskViewSet.as_view({'get': 'global_search'}), name='search-global'),
+        path('tasks/', _task_search, name='search-tasks'),
+        path('projects/', _project_search, name='search-projects'),
+        path('global/', _task_global_search, name='search-global'),
     ])),
     
     # Templates and presets
     path('templates/', include([
-        path('task/', TaskViewSet.as_view({'get': 'templates'}), name='task-templates'),
-        path('project/', ProjectViewSet.as_view({'get': 'templates'}), name='project-templates'),
-        path('save/', TaskViewSet.as_view({'post': 'save_as_template'}), name='save-template'),
+        path('task/', _task_templates, name='task-templates'),
+        path('project/', _project_templates, name='project-templates'),
+        path('save/', _task_save_as_template, name='save-template'),
     ])),
     
     # Import/Export
     path('import/', include([
-        path('csv/', TaskViewSet.as_view({'post': 'import_csv'}), name='import-csv'),
-        path('json/', TaskViewSet.as_view({'post': 'import_json'}), name='import-json'),
-        path('todoist/', TaskViewSet.as_view({'post': 'import_todoist'}), name='import-todoist'),
+        path('csv/', _task_import_csv, name='import-csv'),
+        path('json/', _task_import_json, name='import-json'),
+        path('todoist/', _task_import_todoist, name='import-todoist'),
     ])),
     
     path('export/', include([
-        path('csv/', TaskViewSet.as_view({'get': 'export_csv'}), name='export-csv'),
-        path('json/', TaskViewSet.as_view({'get': 'export_json'}), name='export-json'),
-        path('pdf/', TaskViewSet.as_view({'get': 'export_pdf'}), name='export-pdf'),
+        path('csv/', _task_export_csv, name='export-csv'),
+        path('json/', _task_export_json, name='export-json'),
+        path('pdf/', _task_export_pdf, name='export-pdf'),
     ])),
     
     # Recurring tasks
     path('recurring/', include([
-        path('create/', TaskViewSet.as_view({'post': 'create_recurring'}), name='create-recurring'),
-        path('patterns/', TaskViewSet.as_view({'get': 'recurring_patterns'}), name='recurring-patterns'),
-        path('pause/<int:task_id>/', TaskViewSet.as_view({'post': 'pause_recurring'}), name='pause-recurring'),
+        path('create/', _task_create_recurring, name='create-recurring'),
+        path('patterns/', _task_recurring_patterns, name='recurring-patterns'),
+        path('pause/<int:task_id>/', _task_pause_recurring, name='pause-recurring'),
     ])),
     
     # Time tracking
     path('time/', include([
-        path('start/<int:task_id>/', TaskViewSet.as_view({'post': 'start_timer'}), name='start-timer'),
-        path('stop/<int:task_id>/', TaskViewSet.as_view({'post': 'stop_timer'}), name='stop-timer'),
-        path('log/', TaskViewSet.as_view({'post': 'log_time'}), name='log-time'),
-        path('report/', TaskViewSet.as_view({'get': 'time_report'}), name='time-report'),
+        path('start/<int:task_id>/', _task_start_timer, name='start-timer'),
+        path('stop/<int:task_id>/', _task_stop_timer, name='stop-timer'),
+        path('log/', _task_log_time, name='log-time'),
+        path('report/', _task_time_report, name='time-report'),
     ])),
     
     # Webhooks
     path('webhooks/', include([
-        path('register/', TaskViewSet.as_view({'post': 'register_webhook'}), name='register-webhook'),
-        path('list/', TaskViewSet.as_view({'get': 'list_webhooks'}), name='list-webhooks'),
-        path('delete/<str:webhook_id>/', TaskViewSet.as_view({'delete': 'delete_webhook'}), name='delete-webhook'),
+        path('register/', _task_register_webhook, name='register-webhook'),
+        path('list/', _task_list_webhooks, name='list-webhooks'),
+        path('delete/<str:webhook_id>/', _task_delete_webhook, name='delete-webhook'),
     ])),
 ]
 
@@ -5,15 +5,37 @@ from datetime import datetime, timedelta
 from django.utils import timezone
 from django.core.cache import cache
 from django.db.models import Count, Avg, Sum, Q, F
+from django.db.models.functions import ExtractHour, ExtractIsoWeekDay, TruncDate
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 import json
 import logging
-from collections import defaultdict
+import os
+import queue
+import threading
+import time
 import redis
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Seconds polled dashboard data stays cached; task activity invalidates
+# a user's analytics sooner
+USER_ANALYTICS_CACHE_TIMEOUT = 30
+SYSTEM_METRICS_CACHE_TIMEOUT = 5
+
+# Redis streams holding recent AI metric samples (capped with XADD MAXLEN)
+AI_METRIC_STREAMS = ('ai_processing_times', 'ai_confidence_scores')
+
+
+@lru_cache(maxsize=None)
+def _recency_weights(n: int) -> Tuple[np.ndarray, float]:
+    """Read-only 0.5..1.0 weights for n daily values, oldest first, and their sum"""
+    weights = np.linspace(0.5, 1.0, n)
+    weights.flags.writeable = False
+    return weights, float(weights.sum())
+
+
 @dataclass
 class AnalyticsEvent:
     """Analytics event data structure"""
@@ -35,18 +57,42 @@ class AnalyticsTracker:
     # Redis connection for real-time metrics
     _redis_client = None
     
+    # Tracked events wait here for the background flusher, which writes them
+    # to Redis in batches; events arriving while the queue is full are dropped
+    FLUSH_INTERVAL = 0.05  # seconds
+    FLUSH_BATCH_SIZE = 500
+    _event_queue: queue.Queue = queue.Queue(maxsize=10000)
+    _dropped_events = 0
+    _flusher_thread: Optional[threading.Thread] = None
+    _flusher_pid: Optional[int] = None
+    _flusher_lock = threading.Lock()
+    
     @classmethod
     def _get_redis(cls) -> redis.Redis:
         """Get Redis client for analytics"""
         if not cls._redis_client:
-            cls._redis_client = redis.Redis(
+            client = redis.Redis(
                 host='localhost',
                 port=6379,
                 db=2,  # Separate DB for analytics
                 decode_responses=True
             )
+            cls._drop_legacy_metric_lists(client)
+            cls._redis_client = client
         return cls._redis_client
     
+    @classmethod
+    def _drop_legacy_metric_lists(cls, client: redis.Redis) -> None:
+        """
+        Delete AI metric keys still stored as lists by older releases.
+        
+        The metrics are now streams, and XADD/XRANGE fail with WRONGTYPE on a
+        list key. Runs once per process, when the client is created.
+        """
+        for key in AI_METRIC_STREAMS:
+            if client.type(key) == 'list':
+                client.delete(key)
+    
     @classmethod
     def track_event(cls, event: AnalyticsEvent) -> None:
         """
@@ -55,34 +101,105 @@ class AnalyticsTracker:
         Args:
             event: AnalyticsEvent object
         """
+        cls._enqueue(event)
+    
+    @classmethod
+    def _enqueue(cls, event: AnalyticsEvent, ai_metrics: Optional[Tuple] = None) -> None:
+        """
+        Hand an event (and optional AI metrics) to the background flusher.
+        
+        Never blocks: when the queue is full the event is dropped and counted.
+        """
+        cls._ensure_flusher()
         try:
-            # Store in Redis for real-time processing
-            redis_client = cls._get_redis()
-            
-            # Create event key
-            event_key = f"analytics:{event.event_type}:{event.user_id}:{event.timestamp.timestamp()}"
-            
-            # Store event data
-            redis_client.setex(
-                event_key,
-                86400,  # 24 hour TTL
-                json.dumps({
-                    'event_type': event.event_type,
-                    'user_id': event.user_id,
-                    'data': event.data,
-                    'timestamp': event.timestamp.isoformat(),
-                    'session_id': event.session_id
-                })
+            cls._event_queue.put_nowait((event, ai_metrics))
+        except queue.Full:
+            # Shared with the flusher's read-and-reset in _write_batch
+            with cls._flusher_lock:
+                cls._dropped_events += 1
+    
+    @classmethod
+    def _ensure_flusher(cls) -> None:
+        """Start the flusher thread for this process if it is not running"""
+        if cls._flusher_pid == os.getpid() and cls._flusher_thread.is_alive():
+            return
+        
+        with cls._flusher_lock:
+            if cls._flusher_pid == os.getpid() and cls._flusher_thread.is_alive():
+                return
+            if cls._flusher_pid != os.getpid():
+                # Forked worker: the parent's queue and thread are not ours
+                cls._event_queue = queue.Queue(maxsize=10000)
+                cls._dropped_events = 0
+            cls._flusher_thread = threading.Thread(
+                target=cls._flush_events,
+                name='analytics-flusher',
+                daemon=True
             )
+            cls._flusher_thread.start()
+            cls._flusher_pid = os.getpid()
+    
+    @classmethod
+    def _flush_events(cls) -> None:
+        """Flusher loop: collect queued events for up to FLUSH_INTERVAL, then write them"""
+        event_queue = cls._event_queue
+        while True:
+            batch = [event_queue.get()]
+            deadline = time.monotonic() + cls.FLUSH_INTERVAL
+            while len(batch) < cls.FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(event_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            cls._write_batch(batch)
+    
+    @classmethod
+    def _write_batch(cls, batch: List[Tuple[AnalyticsEvent, Optional[Tuple]]]) -> None:
+        """Write a batch of queued events in one pipelined round-trip"""
+        try:
+            pipe = cls._get_redis().pipeline(transaction=False)
+            for event, ai_metrics in batch:
+                cls._queue_event(pipe, event)
+                if ai_metrics is not None:
+                    cls._update_ai_metrics(pipe, event.user_id, *ai_metrics)
             
-            # Update counters
-            cls._update_counters(event)
+            with cls._flusher_lock:
+                dropped, cls._dropped_events = cls._dropped_events, 0
+            if dropped:
+                pipe.incrby('analytics_dropped_events', dropped)
             
-            # Queue for batch processing
-            redis_client.lpush('analytics_queue', event_key)
+            pipe.execute()
             
         except Exception as e:
-            logger.error(f"Failed to track event: {str(e)}")
+            logger.error(f"Failed to track {len(batch)} events: {str(e)}")
+    
+    @classmethod
+    def _queue_event(cls, pipe: redis.client.Pipeline, event: AnalyticsEvent) -> None:
+        """Queue the Redis writes that record an event on pipe"""
+        # Create event key
+        event_key = f"analytics:{event.event_type}:{event.user_id}:{event.timestamp.timestamp()}"
+        
+        # Store event data for real-time processing
+        pipe.setex(
+            event_key,
+            86400,  # 24 hour TTL
+            json.dumps({
+                'event_type': event.event_type,
+                'user_id': event.user_id,
+                'data': event.data,
+                'timestamp': event.timestamp.isoformat(),
+                'session_id': event.session_id
+            })
+        )
+        
+        # Update counters
+        cls._update_counters(pipe, event)
+        
+        # Queue for batch processing
+        pipe.lpush('analytics_queue', event_key)
     
     @classmethod
     def track_ai_processing(
@@ -118,10 +235,8 @@ class AnalyticsTracker:
             }
         )
         
-        cls.track_event(event)
-        
-        # Update AI performance metrics
-        cls._update_ai_metrics(user_id, processing_time, success, confidence)
+        # AI performance metrics are written in the same batch as the event
+        cls._enqueue(event, (processing_time, success, confidence))
     
     @classmethod
     def track_task_activity(
@@ -153,9 +268,34 @@ class AnalyticsTracker:
         
         cls.track_event(event)
         
+        # Cached analytics for this user no longer reflect their tasks
+        cls._bump_user_analytics_version(user_id)
+        
         # Update user activity score
         cls._update_user_activity(user_id, action)
     
+    @classmethod
+    def _user_analytics_cache_key(cls, user_id: int, days: int) -> str:
+        """Cache key for get_user_analytics, versioned per user"""
+        version = cache.get(f"user_analytics_version:{user_id}", 0)
+        return f"user_analytics:{user_id}:{version}:{days}"
+    
+    @classmethod
+    def _bump_user_analytics_version(cls, user_id: int) -> None:
+        """Invalidate every cached get_user_analytics result for a user
+
+        The version lives in the shared cache, so a bump from any process is
+        seen by all of them. Creating the key with add() keeps concurrent
+        first bumps from both resetting it to the same version.
+        """
+        version_key = f"user_analytics_version:{user_id}"
+        cache.add(version_key, 0, None)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(version_key, 1, None)
+    
     @classmethod
     def get_user_analytics(
         cls,
@@ -172,6 +312,19 @@ class AnalyticsTracker:
         Returns:
             Dictionary containing user analytics
         """
+        cache_key = cls._user_analytics_cache_key(user_id, days)
+        analytics = cache.get(cache_key)
+        
+        if analytics is None:
+            analytics = cls._compute_user_analytics(user_id, days)
+            if analytics:
+                cache.set(cache_key, analytics, USER_ANALYTICS_CACHE_TIMEOUT)
+        
+        return analytics
+    
+    @classmethod
+    def _compute_user_analytics(cls, user_id: int, days: int) -> Dict[str, Any]:
+        """Build get_user_analytics' result; empty dict on failure"""
         try:
             from ..models import Task
             
@@ -232,6 +385,18 @@ class AnalyticsTracker:
         Returns:
             Dictionary containing system metrics
         """
+        metrics = cache.get('system_metrics')
+        
+        if metrics is None:
+            metrics = cls._compute_system_metrics()
+            if 'error' not in metrics:
+                cache.set('system_metrics', metrics, SYSTEM_METRICS_CACHE_TIMEOUT)
+        
+        return metrics
+    
+    @classmethod
+    def _compute_system_metrics(cls) -> Dict[str, Any]:
+        """Build get_system_metrics' result; {'error': ...} on failure"""
         try:
             redis_client = cls._get_redis()
             
@@ -276,23 +441,26 @@ class AnalyticsTracker:
             today = timezone.now().date()
             yesterday = today - timedelta(days=1)
             
-            # Today's progress
-            today_tasks = Task.objects.filter(
-                user_id=user_id,
-                created_at__date=today
+            # Today's progress and yesterday's completions in one query,
+            # reading only rows created today or completed since yesterday
+            counts = Task.objects.filter(
+                Q(created_at__date=today) | Q(completed_at__date__range=(yesterday, today)),
+                user_id=user_id
+            ).aggregate(
+                tasks_created=Count('id', filter=Q(created_at__date=today)),
+                completed_today=Count('id', filter=Q(
+                    created_at__date=today,
+                    is_completed=True,
+                    completed_at__date=today
+                )),
+                yesterday_completed=Count('id', filter=Q(
+                    is_completed=True,
+                    completed_at__date=yesterday
+                ))
             )
-            
-            completed_today = today_tasks.filter(
-                is_completed=True,
-                completed_at__date=today
-            ).count()
-            
-            # Compare with yesterday
-            yesterday_completed = Task.objects.filter(
-                user_id=user_id,
-                is_completed=True,
-                completed_at__date=yesterday
-            ).count()
+            tasks_created = counts['tasks_created']
+            completed_today = counts['completed_today']
+            yesterday_completed = counts['yesterday_completed']
             
             # Calculate trends
             completion_trend = 'improving' if completed_today > yesterday_completed else 'stable'
@@ -306,10 +474,10 @@ class AnalyticsTracker:
             return {
                 'date': today.isoformat(),
                 'tasks_completed': completed_today,
-                'tasks_created': today_tasks.count(),
+                'tasks_created': tasks_created,
                 'completion_rate': (
-                    completed_today / today_tasks.count() * 100
-                    if today_tasks.count() > 0 else 0
+                    completed_today / tasks_created * 100
+                    if tasks_created > 0 else 0
                 ),
                 'trend': completion_trend,
                 'focus_time_minutes': focus_time,
@@ -326,66 +494,53 @@ class AnalyticsTracker:
             return {}
     
     @classmethod
-    def _update_counters(cls, event: AnalyticsEvent) -> None:
-        """Update Redis counters for real-time metrics"""
-        try:
-            redis_client = cls._get_redis()
-            
-            # Update event type counter
-            redis_client.hincrby(
-                f"counters:{event.event_type}",
-                event.timestamp.strftime('%Y-%m-%d-%H'),
-                1
-            )
-            
-            # Update user activity
-            redis_client.zadd(
-                'active_users',
-                {str(event.user_id): event.timestamp.timestamp()}
-            )
-            
-            # Update global counters
-            redis_client.incr(f"global:{event.event_type}")
-            
-        except Exception as e:
-            logger.error(f"Failed to update counters: {str(e)}")
+    def _update_counters(cls, pipe: redis.client.Pipeline, event: AnalyticsEvent) -> None:
+        """Queue Redis counter updates for real-time metrics on pipe"""
+        # Update event type counter
+        pipe.hincrby(
+            f"counters:{event.event_type}",
+            event.timestamp.strftime('%Y-%m-%d-%H'),
+            1
+        )
+        
+        # Update user activity
+        pipe.zadd(
+            'active_users',
+            {str(event.user_id): event.timestamp.timestamp()}
+        )
+        
+        # Update global counters
+        pipe.incr(f"global:{event.event_type}")
     
     @classmethod
     def _update_ai_metrics(
         cls,
+        pipe: redis.client.Pipeline,
         user_id: int,
         processing_time: float,
         success: bool,
         confidence: float
     ) -> None:
-        """Update AI-specific metrics"""
-        try:
-            redis_client = cls._get_redis()
-            
-            # Track processing times
-            redis_client.lpush('ai_processing_times', processing_time)
-            redis_client.ltrim('ai_processing_times', 0, 999)  # Keep last 1000
-            
-            # Track success rate
-            if success:
-                redis_client.incr('ai_success_count')
-            else:
-                redis_client.incr('ai_failure_count')
-            
-            # Track confidence scores
-            redis_client.lpush('ai_confidence_scores', confidence)
-            redis_client.ltrim('ai_confidence_scores', 0, 999)
-            
-            # Update user-specific AI metrics
-            redis_client.hincrby(f"user_ai_usage:{user_id}", 'count', 1)
-            redis_client.hincrbyfloat(
-                f"user_ai_usage:{user_id}",
-                'total_time',
-                processing_time
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to update AI metrics: {str(e)}")
+        """Queue AI-specific metric updates on pipe"""
+        # Track processing times in a stream capped at about the last 1000
+        pipe.xadd('ai_processing_times', {'value': processing_time}, maxlen=1000, approximate=True)
+        
+        # Track success rate
+        if success:
+            pipe.incr('ai_success_count')
+        else:
+            pipe.incr('ai_failure_count')
+        
+        # Track confidence scores
+        pipe.xadd('ai_confidence_scores', {'value': confidence}, maxlen=1000, approximate=True)
+        
+        # Update user-specific AI metrics
+        pipe.hincrby(f"user_ai_usage:{user_id}", 'count', 1)
+        pipe.hincrbyfloat(
+            f"user_ai_usage:{user_id}",
+            'total_time',
+            processing_time
+        )
     
     @classmethod
     def _calculate_productivity_metrics(
@@ -398,26 +553,28 @@ class AnalyticsTracker:
         
         start_date = timezone.now() - timedelta(days=days)
         
-        # Daily completion rates
-        daily_rates = []
-        for i in range(days):
-            date = start_date.date() + timedelta(days=i)
-            
-            day_tasks = Task.objects.filter(
-                user_id=user_id,
-                created_at__date=date
-            )
-            
-            completed = day_tasks.filter(is_completed=True).count()
-            total = day_tasks.count()
-            
-            if total > 0:
-                daily_rates.append(completed / total * 100)
+        # Daily completion rates, grouped by creation day in one query
+        daily_counts = Task.objects.filter(
+            user_id=user_id,
+            created_at__date__gte=start_date.date(),
+            created_at__date__lt=start_date.date() + timedelta(days=days)
+        ).annotate(
+            day=TruncDate('created_at')
+        ).values('day').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(is_completed=True))
+        ).order_by('day')
+        
+        # One array shared by all the statistics below
+        daily_rates = np.fromiter(
+            (row['completed'] / row['total'] * 100 for row in daily_counts),
+            dtype=np.float64
+        )
         
         # Calculate statistics
-        if daily_rates:
+        if daily_rates.size:
             return {
-                'average_completion_rate': np.mean(daily_rates),
+                'average_completion_rate': daily_rates.mean(),
                 'completion_rate_trend': cls._calculate_trend(daily_rates),
                 'consistency_score': cls._calculate_consistency(daily_rates),
                 'peak_productivity_day': cls._find_peak_day(user_id, days),
@@ -467,43 +624,41 @@ class AnalyticsTracker:
         """Analyze user's activity patterns"""
         from ..models import Task
         
-        # Get task creation times
         tasks = Task.objects.filter(
             user_id=user_id,
             created_at__gte=timezone.now() - timedelta(days=days)
-        ).values_list('created_at', flat=True)
-        
-        if not tasks:
-            return {'no_activity': True}
+        )
         
-        # Analyze by hour of day
-        hour_distribution = defaultdict(int)
-        day_distribution = defaultdict(int)
+        # Histogram by hour of day, counted in the database (at most 24 rows)
+        hour_counts = np.zeros(24, dtype=np.int64)
+        for row in tasks.annotate(
+            hour=ExtractHour('created_at')
+        ).values('hour').annotate(count=Count('id')).order_by():
+            hour_counts[row['hour']] = row['count']
         
-        for task_time in tasks:
-            hour_distribution[task_time.hour] += 1
-            day_distribution[task_time.weekday()] += 1
+        if not hour_counts.any():
+            return {'no_activity': True}
         
-        # Find peak hours
-        peak_hours = sorted(
-            hour_distribution.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]
+        # Same for day of week; ISO weekdays run 1 (Monday) to 7 (Sunday)
+        day_counts = np.zeros(7, dtype=np.int64)
+        for row in tasks.annotate(
+            weekday=ExtractIsoWeekDay('created_at')
+        ).values('weekday').annotate(count=Count('id')).order_by():
+            day_counts[row['weekday'] - 1] = row['count']
         
-        # Find most active days
-        peak_days = sorted(
-            day_distribution.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )[:3]
+        # Top three by count among the hours/days that saw activity; a stable
+        # sort keeps ties in hour/day order
+        active_hours = np.flatnonzero(hour_counts)
+        peak_hours = active_hours[np.argsort(-hour_counts[active_hours], kind='stable')[:3]]
+        active_days = np.flatnonzero(day_counts)
+        peak_days = active_days[np.argsort(-day_counts[active_days], kind='stable')[:3]]
         
         return {
-            'peak_hours': [h for h, _ in peak_hours],
-            'peak_days': [cls._day_name(d) for d, _ in peak_days],
-            'activity_distribution': dict(hour_distribution),
+            'peak_hours': peak_hours.tolist(),
+            'peak_days': [cls._day_name(d) for d in peak_days.tolist()],
+            'activity_distribution': dict(zip(active_hours.tolist(), hour_counts[active_hours].tolist())),
             'consistency': cls._calculate_activity_consistency(
-                list(hour_distribution.values())
+                hour_counts[active_hours].tolist()
             )
         }
     
@@ -587,14 +742,31 @@ class AnalyticsTracker:
             return 0.0
     
     @classmethod
-    def _calculate_trend(cls, values: List[float]) -> str:
+    def _get_average_metric(cls, stream_name: str, window_seconds: int) -> float:
+        """Average of a metric stream's values recorded within the time window"""
+        try:
+            redis_client = cls._get_redis()
+            # Stream entry IDs start with their millisecond timestamp
+            since_ms = int((time.time() - window_seconds) * 1000)
+            entries = redis_client.xrange(stream_name, min=since_ms)
+            if not entries:
+                return 0.0
+            return float(np.mean([float(fields['value']) for _, fields in entries]))
+        except Exception:
+            return 0.0
+    
+    @classmethod
+    def _calculate_trend(cls, values: np.ndarray) -> str:
         """Calculate trend from values"""
         if len(values) < 2:
             return 'insufficient_data'
         
-        # Simple linear regression
-        x = np.arange(len(values))
-        slope = np.polyfit(x, values, 1)[0]
+        # Least-squares slope over x = 0..n-1. The x sums have a closed form
+        # (sum of squared centered x is n(n^2 - 1)/12), so this is one dot
+        # product instead of a polyfit
+        n = len(values)
+        centered_x = np.arange(n) - (n - 1) / 2
+        slope = centered_x @ np.asarray(values, dtype=np.float64) * 12 / (n * (n * n - 1))
         
         if slope > 0.1:
             return 'improving'
@@ -611,9 +783,9 @@ class AnalyticsTracker:
         return days[day_num]
     
     @classmethod
-    def _calculate_consistency(cls, rates: List[float]) -> float:
+    def _calculate_consistency(cls, rates: np.ndarray) -> float:
         """Calculate consistency score from completion rates"""
-        if not rates:
+        if len(rates) == 0:
             return 0.0
         
         # Lower standard deviation = higher consistency
@@ -621,14 +793,14 @@ class AnalyticsTracker:
         return max(0, 100 - std_dev * 2)
     
     @classmethod
-    def _calculate_productivity_score(cls, daily_rates: List[float]) -> float:
+    def _calculate_productivity_score(cls, daily_rates: np.ndarray) -> float:
         """Calculate overall productivity score"""
-        if not daily_rates:
+        if len(daily_rates) == 0:
             return 0.0
         
         # Weighted average with recent days having more weight
-        weights = np.linspace(0.5, 1.0, len(daily_rates))
-        return np.average(daily_rates, weights=weights)
+        weights, weight_sum = _recency_weights(len(daily_rates))
+        return float(np.dot(daily_rates, weights) / weight_sum)
     
     @classmethod
     def _get_cache_hit_rate(cls) -> float:
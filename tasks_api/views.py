@@ -5,7 +5,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.utils import timezone
 from datetime import timedelta
-from django.db.models import Q
+from django.db.models import Count, Exists, OuterRef, Q
 from .models import Account, Project, Section, Task, TaskView
 from .serializers import (
     ProjectSerializer, SectionSerializer, TaskSerializer,
@@ -208,10 +208,13 @@ class TaskViewSet(viewsets.ModelViewSet):
     """ViewSet for Task model with all required endpoints."""
     queryset = Task.objects.filter(totally_completed=False)
     serializer_class = TaskSerializer
+    # Relations TaskSerializer reads for every task; prefetched so list
+    # endpoints stay at a fixed number of queries
+    serializer_prefetch = ('task_views', 'assigned_to')
 
     def get_queryset(self):
         """Filter tasks by user_id and project if specified, excluding totally completed tasks."""
-        queryset = Task.objects.filter(totally_completed=False)
+        queryset = Task.objects.filter(totally_completed=False).prefetch_related(*self.serializer_prefetch)
         user_id = self.request.query_params.get('user_id')
         project_id = self.request.query_params.get('project_id')
 
@@ -255,7 +258,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if project_id:
             queryset = queryset.filter(project_id=project_id)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -279,7 +282,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
         return Response(serializer.data)
 
     @action(detail=True, methods=['patch'])
@@ -385,13 +388,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         # Special handling for inbox view to match counting logic
         if view == 'inbox':
             # Inbox: tasks with inbox view BUT NOT project view (non-project tasks only)
-            inbox_task_ids = TaskView.objects.filter(view='inbox').values_list('task_id', flat=True)
-            project_task_ids = TaskView.objects.filter(view='project').values_list('task_id', flat=True)
             queryset = Task.objects.filter(
-                id__in=inbox_task_ids,
+                Exists(TaskView.objects.filter(task=OuterRef('pk'), view='inbox')),
                 totally_completed=False
             ).exclude(
-                id__in=project_task_ids
+                Exists(TaskView.objects.filter(task=OuterRef('pk'), view='project'))
             )
         else:
             # For other views, use standard logic
@@ -401,7 +402,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -416,7 +417,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if user_id:
             queryset = queryset.filter(user_id=user_id)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -435,7 +436,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             queryset = Task.objects.filter(due_date=target_date, totally_completed=False)
             if user_id:
                 queryset = queryset.filter(user_id=user_id)
-            serializer = self.get_serializer(queryset, many=True)
+            serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
             return Response(serializer.data)
         except ValueError:
             return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
@@ -463,7 +464,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if section_id:
             queryset = queryset.filter(section_id=section_id)
 
-        serializer = self.get_serializer(queryset, many=True)
+        serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=['get'])
@@ -491,7 +492,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             if user_id:
                 queryset = queryset.filter(user_id=user_id)
 
-            serializer = self.get_serializer(queryset, many=True)
+            serializer = self.get_serializer(queryset.prefetch_related(*self.serializer_prefetch), many=True)
             return Response(serializer.data)
         except ValueError:
             return Response({'error': 'Invalid date format. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
@@ -532,21 +533,11 @@ class TaskViewSet(viewsets.ModelViewSet):
         if user_id:
             active_tasks = active_tasks.filter(user_id=user_id)
 
-        # Filter task views by user if specified
-        task_view_filter = {}
-        if user_id:
-            user_task_ids = active_tasks.values_list('id', flat=True)
-            inbox_task_ids = TaskView.objects.filter(view='inbox', task_id__in=user_task_ids).values_list('task_id', flat=True)
-            project_task_ids = TaskView.objects.filter(view='project', task_id__in=user_task_ids).values_list('task_id', flat=True)
-        else:
-            inbox_task_ids = TaskView.objects.filter(view='inbox').values_list('task_id', flat=True)
-            project_task_ids = TaskView.objects.filter(view='project').values_list('task_id', flat=True)
-
         # Inbox: tasks with inbox view BUT NOT project view (non-project tasks only)
         inbox_count = active_tasks.filter(
-            id__in=inbox_task_ids
+            Exists(TaskView.objects.filter(task=OuterRef('pk'), view='inbox'))
         ).exclude(
-            id__in=project_task_ids
+            Exists(TaskView.objects.filter(task=OuterRef('pk'), view='project'))
         ).count()
 
         # Today: tasks due today (matching Today page logic)
@@ -571,9 +562,15 @@ class TaskViewSet(viewsets.ModelViewSet):
         projects = Project.objects.all()
         if user_id:
             projects = projects.filter(user_id=user_id)
-        project_counts = {}
-        for project in projects:
-            project_counts[str(project.id)] = active_tasks.filter(project_id=project.id).count()
+        counts_by_project = dict(
+            active_tasks.exclude(project_id__isnull=True)
+            .values_list('project_id')
+            .annotate(Count('id'))
+        )
+        project_counts = {
+            str(project_id): counts_by_project.get(project_id, 0)
+            for project_id in projects.values_list('id', flat=True)
+        }
 
         return Response({
             'inbox': inbox_count,
@@ -9,6 +9,8 @@ from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from datetime import date, datetime, timedelta
+from django.core.cache import cache
+from django.db.models import Count, Max
 from .models import Task
 from .agents.scheduler import (
     TaskScheduler,
@@ -16,10 +18,52 @@ from .agents.scheduler import (
     calculate_deadline_factor,
     calculate_priority_factor
 )
+import hashlib
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds a generated schedule stays cached; task edits invalidate it sooner
+SCHEDULE_CACHE_TIMEOUT = 300
+
+
+def _schedule_cache_key(queryset, **params) -> str:
+    """
+    Cache key for the schedule built from queryset with the given parameters.
+
+    The latest updated_at and row count of the queryset act as a version
+    token, so creating, editing or deleting a matching task yields a new key.
+    """
+    version = queryset.aggregate(last_updated=Max('updated_at'), task_count=Count('id'))
+    raw = json.dumps([str(queryset.query), params, version], sort_keys=True, default=str)
+    return f"scheduler:generate:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+def _cached_schedule(queryset, start_date=None, horizon_days=14, slot_capacities=None):
+    """
+    generate_schedule_from_queryset, reusing the result of an identical call
+    while the queryset's tasks are unchanged.
+    """
+    cache_key = _schedule_cache_key(
+        queryset,
+        start_date=start_date,
+        horizon_days=horizon_days,
+        slot_capacities=slot_capacities
+    )
+    schedule_result = cache.get(cache_key)
+
+    if schedule_result is None:
+        schedule_result = generate_schedule_from_queryset(
+            queryset=queryset,
+            start_date=start_date,
+            horizon_days=horizon_days,
+            slot_capacities=slot_capacities if slot_capacities else None
+        )
+        cache.set(cache_key, schedule_result, SCHEDULE_CACHE_TIMEOUT)
+
+    return schedule_result
+
 
 @api_view(['GET', 'POST'])
 def generate_schedule(request):
@@ -129,12 +173,12 @@ def generate_schedule(request):
         if not include_completed:
             queryset = queryset.filter(completed=False, totally_completed=False)
 
-        # Generate schedule
-        schedule_result = generate_schedule_from_queryset(
-            queryset=queryset,
+        # Reuse the schedule from an identical request while its tasks are unchanged
+        schedule_result = _cached_schedule(
+            queryset,
             start_date=start_date,
             horizon_days=horizon_days,
-            slot_capacities=slot_capacities if slot_capacities else None
+            slot_capacities=slot_capacities
         )
 
         return Response(schedule_result)
@@ -193,8 +237,8 @@ def schedule_preview(request):
         )
 
         # Generate single-day schedule
-        schedule_result = generate_schedule_from_queryset(
-            queryset=queryset,
+        schedule_result = _cached_schedule(
+            queryset,
             start_date=target_date,
             horizon_days=1
         )
@@ -205,7 +249,7 @@ def schedule_preview(request):
         return Response({
             'date': target_date.isoformat(),
             'schedule': day_schedule,
-            'task_count': len(list(queryset))
+            'task_count': queryset.count()
         })
 
     except Exception as e:
@@ -348,8 +392,8 @@ def workload_analysis(request):
                 queryset = queryset.filter(project_id=project_id)
 
         # Generate full schedule
-        schedule_result = generate_schedule_from_queryset(
-            queryset=queryset,
+        schedule_result = _cached_schedule(
+            queryset,
             start_date=today,
             horizon_days=horizon_days
         )
@@ -382,17 +426,14 @@ def workload_analysis(request):
         busiest_day = max(daily_stats, key=lambda x: x['scheduled_minutes'])
         lightest_day = min(daily_stats, key=lambda x: x['scheduled_minutes'])
 
-        # Priority breakdown
+        # Priority breakdown (one GROUP BY instead of loading every task)
+        tasks_per_priority = dict(
+            queryset.order_by().values_list('priority').annotate(Count('id'))
+        )
         priority_counts = {
-            'emergency': 0,
-            'urgent': 0,
-            'high': 0,
-            'medium': 0,
-            'low': 0
+            priority: tasks_per_priority.get(priority, 0)
+            for priority in ('emergency', 'urgent', 'high', 'medium', 'low')
         }
-        for task in queryset:
-            if task.priority in priority_counts:
-                priority_counts[task.priority] += 1
 
         return Response({
             'horizon_days': horizon_days,
@@ -403,7 +444,7 @@ def workload_analysis(request):
                 'total_capacity_minutes': total_capacity,
                 'average_utilization': f"{avg_utilization:.1f}%",
                 'average_daily_minutes': round(total_minutes / horizon_days, 1),
-                'total_tasks': queryset.count()
+                'total_tasks': sum(tasks_per_priority.values())
             },
             'highlights': {
                 'busiest_day': {